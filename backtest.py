@@ -15,25 +15,50 @@ Multi-timeframe strategy (signals on 15m, TP/SL on 1m):
         --signal-tf 15m --granular-tf 1m \
         --strategy strategies.OversoldBounceMTFStrategy
 
+Fast NumPy replay for strategies exposing ``vectorized_signals``:
+
+    python backtest.py --symbol ETHUSDT --start 2025-10-01 --end 2025-12-31 \
+        --signal-tf 15m --strategy strategies.MAStrategy --vectorized
+
 Using a strategy from your own file:
 
     python backtest.py --symbol BTCUSDT --start 2025-10-01 --end 2025-12-31 \
         --signal-tf 15m --strategy my_strats.SuperAlpha
+
+Strategies run with ``runonce=True, preload=True, exactbars=0`` by
+default.  A strategy can pin its own Cerebro run options with a
+``_required_cerebro_opts`` dict class attribute; the runner applies it
+on top of those defaults.
 """
 
 import argparse
+import ast
 import importlib
+import logging
 import sys
 import warnings
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import List, Optional
 
 import backtrader as bt
+import numpy as np
 
 from collector import collect, load_bt_dataframe
 
 # Suppress Binance Vision SSL warnings (self-signed cert)
 warnings.filterwarnings("ignore", message="Unverified HTTPS request")
 
+log = logging.getLogger(__name__)
+
+
+class BacktestConfigError(ValueError):
+    """
+    Bad input to ``run_backtest`` (unknown timeframe, strategy path or
+    param, or a strategy's conflicting ``_required_cerebro_opts``).  Raised rather than exiting so sweep workers report it
+    through ``Pool.map``; ``main()`` turns it into an exit message.
+    """
+
 
 # ---------------------------------------------------------------------------
 # Binance Futures-style commission
@@ -48,14 +73,18 @@ class BinanceFuturesCommInfo(bt.CommInfoBase):
         ("commission_type", "taker"),
     )
 
+    def __init__(self):
+        super().__init__()
+        # commission_type is fixed for the run: resolve the rate once
+        # instead of on every fill.
+        self._rate = {
+            "maker": self.p.commission_maker,
+            "taker": self.p.commission_taker,
+        }.get(self.p.commission_type,
+              (self.p.commission_maker + self.p.commission_taker) / 2)
+
     def _getcommission(self, size, price, pseudoexec):
-        if self.p.commission_type == "maker":
-            rate = self.p.commission_maker
-        elif self.p.commission_type == "taker":
-            rate = self.p.commission_taker
-        else:
-            rate = (self.p.commission_maker + self.p.commission_taker) / 2
-        return abs(size) * price * rate
+        return abs(size) * price * self._rate
 
 
 # ---------------------------------------------------------------------------
@@ -90,7 +119,8 @@ _TF_SHARPE_FACTOR = {
 def _parse_tf(label: str):
     """Return (bt.TimeFrame, compression) for a Binance-style interval."""
     if label not in _TF_MAP:
-        sys.exit(f"Unknown timeframe '{label}'. Supported: {', '.join(_TF_MAP)}")
+        raise BacktestConfigError(
+            f"Unknown timeframe '{label}'. Supported: {', '.join(_TF_MAP)}")
     return _TF_MAP[label]
 
 
@@ -106,7 +136,7 @@ def _load_strategy(dotted_path: str):
         my_pkg.strats.Alpha          -> from my_pkg.strats import Alpha
     """
     if "." not in dotted_path:
-        sys.exit(
+        raise BacktestConfigError(
             f"Strategy must be 'module.ClassName' (e.g. strategies.MAStrategy), "
             f"got '{dotted_path}'"
         )
@@ -114,205 +144,337 @@ def _load_strategy(dotted_path: str):
     try:
         mod = importlib.import_module(module_path)
     except ModuleNotFoundError:
-        sys.exit(f"Cannot import module '{module_path}'")
+        raise BacktestConfigError(f"Cannot import module '{module_path}'") from None
     cls = getattr(mod, class_name, None)
     if cls is None:
-        sys.exit(f"Module '{module_path}' has no class '{class_name}'")
+        raise BacktestConfigError(f"Module '{module_path}' has no class '{class_name}'")
     if not (isinstance(cls, type) and issubclass(cls, bt.Strategy)):
-        sys.exit(f"'{dotted_path}' is not a bt.Strategy subclass")
+        raise BacktestConfigError(f"'{dotted_path}' is not a bt.Strategy subclass")
     return cls
 
 
 # ---------------------------------------------------------------------------
-# Main
+# --param value casting
 # ---------------------------------------------------------------------------
-def main():
-    parser = argparse.ArgumentParser(
-        description="Run a backtrader backtest with Binance Vision data",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog=__doc__,
-    )
+_BOOL_WORDS = {"true": True, "yes": True, "false": False, "no": False}
 
-    # Data / collection
-    parser.add_argument("--symbol", required=True, help="Trading pair, e.g. ETHUSDT")
-    parser.add_argument("--start", required=True, help="Start date YYYY-MM-DD (inclusive)")
-    parser.add_argument("--end", required=True, help="End date YYYY-MM-DD (exclusive)")
-    parser.add_argument("--data-dir", default="Data", help="Local data cache directory (default: Data)")
 
-    # Timeframes
-    parser.add_argument(
-        "--signal-tf", required=True,
-        help="Timeframe for signal generation / single-TF strategies (e.g. 15m, 1h)",
-    )
-    parser.add_argument(
-        "--granular-tf", default=None,
-        help="Optional finer timeframe for TP/SL execution in MTF mode (e.g. 1m). "
-             "When set, data is loaded at this TF and resampled to --signal-tf.",
-    )
+def _cast_param(val: str):
+    """
+    Auto-cast a ``--param`` value: bool words, then any Python literal
+    (int, float, None, True, tuples, ...), else the raw string.
+    """
+    v = val.strip()
+    if v.lower() in _BOOL_WORDS:
+        return _BOOL_WORDS[v.lower()]
+    try:
+        return ast.literal_eval(v)
+    except (ValueError, SyntaxError):
+        return val  # keep as string
 
-    # Strategy
-    parser.add_argument(
-        "--strategy", required=True,
-        help="Dotted path to a bt.Strategy class (e.g. strategies.MAStrategy)",
+
+# ---------------------------------------------------------------------------
+# Backtest configuration
+# ---------------------------------------------------------------------------
+@dataclass
+class BacktestConfig:
+    """All inputs of one backtest run; field names mirror the CLI flags."""
+    symbol: str
+    start: str
+    end: str
+    signal_tf: str
+    strategy: str
+    data_dir: str = "Data"
+    granular_tf: Optional[str] = None
+    tp: Optional[float] = None
+    sl: Optional[float] = None
+    param: List[str] = field(default_factory=list)
+    cash: float = 10_000
+    leverage: float = 5
+    position_pct: float = 0.95
+    commission_maker: float = 0.0002
+    commission_taker: float = 0.0005
+    commission_type: str = "taker"
+    slippage: float = 0.0001
+    vectorized: bool = False
+    plot: bool = False
+    plot_file: Optional[str] = None
+
+
+# ---------------------------------------------------------------------------
+# Shared run helpers
+# ---------------------------------------------------------------------------
+def make_comminfo(cfg: BacktestConfig) -> BinanceFuturesCommInfo:
+    """The commission/leverage model for *cfg*'s broker settings."""
+    return BinanceFuturesCommInfo(
+        commission_maker=cfg.commission_maker,
+        commission_taker=cfg.commission_taker,
+        commission_type=cfg.commission_type,
+        margin=1 / cfg.leverage,
     )
 
-    # Strategy parameters (TP / SL shortcuts + generic --param)
-    parser.add_argument("--tp", type=float, default=None,
-                        help="Take-profit %% as decimal (e.g. 0.015 = 1.5%%). "
-                             "Passed to strategy as takeprofit_pct.")
-    parser.add_argument("--sl", type=float, default=None,
-                        help="Stop-loss %% as decimal (e.g. 0.006 = 0.6%%). "
-                             "Passed to strategy as stoploss_pct.")
-    parser.add_argument("--param", action="append", default=[], metavar="KEY=VALUE",
-                        help="Arbitrary strategy param, e.g. --param rsi_period=10. "
-                             "Numeric values are auto-cast. Can be repeated.")
 
-    # Broker
-    parser.add_argument("--cash", type=float, default=10_000, help="Starting cash (default: 10000)")
-    parser.add_argument("--leverage", type=float, default=5, help="Leverage multiplier (default: 5)")
-    parser.add_argument("--position-pct", type=float, default=0.95,
-                        help="Fraction of equity per trade (default: 0.95)")
-    parser.add_argument("--commission-maker", type=float, default=0.0002,
-                        help="Maker commission rate (default: 0.0002)")
-    parser.add_argument("--commission-taker", type=float, default=0.0005,
-                        help="Taker commission rate (default: 0.0005)")
-    parser.add_argument("--commission-type", default="taker",
-                        choices=["maker", "taker", "blended"],
-                        help="Commission type (default: taker)")
+def _log_banner(cfg: BacktestConfig, strat_kwargs: dict, start_val: float,
+                vectorized: bool = False) -> None:
+    banner = [
+        f"\n{'='*50}",
+        f" Symbol      : {cfg.symbol}",
+        f" Period       : {cfg.start} → {cfg.end}",
+        f" Signal TF    : {cfg.signal_tf}",
+    ]
+    if cfg.granular_tf is not None:
+        banner.append(f" Granular TF  : {cfg.granular_tf}")
+    banner.append(f" Strategy     : {cfg.strategy}")
+    if strat_kwargs:
+        banner.append(f" Params       : {strat_kwargs}")
+    if vectorized:
+        banner.append(" Engine       : vectorized")
+    banner += [
+        f" Leverage     : {cfg.leverage}x",
+        f" Slippage     : {cfg.slippage*100:.3f}%",
+        f" Starting cash: ${start_val:,.2f}",
+        f"{'='*50}\n",
+    ]
+    log.info("\n".join(banner))
+
+
+def _make_result(start_val, end_val, strat_kwargs, total, won, lost, max_dd,
+                 sharpe_ratio) -> dict:
+    return {
+        "start_value": start_val,
+        "end_value": end_val,
+        "return": (end_val - start_val) / start_val * 100,
+        "trades": total,
+        "won": won,
+        "lost": lost,
+        "win_rate": (won / total * 100) if total > 0 else 0.0,
+        "max_dd": max_dd,
+        "sharpe": sharpe_ratio,
+        "params": strat_kwargs,
+    }
+
+
+def _log_results(result: dict) -> None:
+    sharpe_ratio = result["sharpe"]
+    sharpe_str = f"{sharpe_ratio:.3f}" if sharpe_ratio is not None else "N/A"
+    log.info("\n".join([
+        f"\n{'='*50}",
+        " RESULTS",
+        f"{'='*50}",
+        f" Ending cash   : ${result['end_value']:,.2f}",
+        f" Total return  : {result['return']:+.2f}%",
+        f" Trades        : {result['trades']}  (won {result['won']} / lost {result['lost']})",
+        f" Win rate      : {result['win_rate']:.1f}%",
+        f" Max drawdown  : {result['max_dd']:.2f}%",
+        f" Sharpe ratio  : {sharpe_str}",
+        f"{'='*50}\n",
+    ]))
 
-    # Slippage
-    parser.add_argument("--slippage", type=float, default=0.0001,
-                        help="Slippage per trade as fraction of price (default: 0.0001 = 0.01%%). "
-                             "Set to 0 for ideal fills.")
 
-    # Output
-    parser.add_argument("--plot", action="store_true", help="Show backtrader chart after run")
-    parser.add_argument("--plot-file", default=None,
-                        help="Save chart to this file (e.g. result.png)")
+# ---------------------------------------------------------------------------
+# Vectorized run (strategies exposing ``vectorized_signals``)
+# ---------------------------------------------------------------------------
+def _run_vectorized(cfg: BacktestConfig, strategy_cls, strat_kwargs: dict,
+                    start_dt: datetime, end_dt: datetime) -> dict:
+    """
+    Replay ``strategy_cls.vectorized_signals`` over the signal-TF arrays and
+    account for it like the backtrader broker: PercentSizer sizing off the
+    signal close, the same commission model, and per-bar mark-to-market
+    equity for drawdown and Sharpe.  No margin calls or order rejections
+    are modelled, so treat it as a fast screen for parameter sweeps.
+    """
+    bt_df = load_bt_dataframe(cfg.symbol, cfg.signal_tf, cfg.data_dir)
+    bt_df = bt_df.loc[start_dt:end_dt]  # PandasData fromdate/todate are inclusive
+    o, h, l, c = (bt_df[col].to_numpy() for col in ("open", "high", "low", "close"))
 
-    args = parser.parse_args()
+    params = {k: getattr(strategy_cls.params, k) for k in strategy_cls.params._getkeys()}
+    params.update(strat_kwargs)
+    params.pop("target_data_index", None)
+
+    _log_banner(cfg, strat_kwargs, cfg.cash, vectorized=True)
+    entries, exits, entry_px, exit_px = strategy_cls.vectorized_signals(
+        o, h, l, c, slippage=cfg.slippage, **params,
+    )
+
+    comminfo = make_comminfo(cfg)
+    exposure = cfg.position_pct * cfg.leverage
+    cash = float(cfg.cash)
+    equity = np.full(len(c), cash)
+    won = lost = 0
+    for sig, out, ep, xp in zip(entries, exits, entry_px, exit_px):
+        size = cash * exposure / c[sig]
+        entry_comm = comminfo.getcommission(size, ep)
+        held = slice(sig + 1, out + 1 if out >= 0 else len(c))
+        equity[held] = cash - entry_comm + size * (c[held] - ep)
+        if out < 0:
+            break  # still open at the end: marked to market above
+        pnlcomm = size * (xp - ep) - entry_comm - comminfo.getcommission(size, xp)
+        cash += pnlcomm
+        equity[out + 1:] = cash
+        won += pnlcomm >= 0
+        lost += pnlcomm < 0
+
+    curve = np.concatenate(([float(cfg.cash)], equity))
+    peak = np.maximum.accumulate(curve)
+    rets = curve[1:] / curve[:-1] - 1
+    sharpe_ratio = None
+    if len(rets) and rets.std() > 0:
+        factor = _TF_SHARPE_FACTOR.get(cfg.signal_tf, 252)
+        sharpe_ratio = float(rets.mean() / rets.std() * np.sqrt(factor))
+
+    result = _make_result(
+        cfg.cash, float(curve[-1]), strat_kwargs,
+        total=len(entries), won=int(won), lost=int(lost),
+        max_dd=float(((peak - curve) / peak).max() * 100),
+        sharpe_ratio=sharpe_ratio,
+    )
+    _log_results(result)
+    return result
 
+
+# ---------------------------------------------------------------------------
+# Single run (importable, picklable — usable from multiprocessing sweeps)
+# ---------------------------------------------------------------------------
+def run_backtest(cfg: BacktestConfig) -> dict:
+    """
+    Run one backtest described by *cfg* and return its headline metrics.
+
+    Progress and warnings go through the ``logging`` module, so parameter
+    sweeps can call this from worker processes (e.g.
+    ``multiprocessing.Pool(n).map(run_backtest, configs)``) without the
+    console noise of the CLI.  Bad input raises ``BacktestConfigError``.
+    """
     # Parse date range for feed filtering (must match --start/--end)
-    start_dt = datetime.strptime(args.start, "%Y-%m-%d")
-    end_dt = datetime.strptime(args.end, "%Y-%m-%d")
+    start_dt = datetime.fromisoformat(cfg.start)
+    end_dt = datetime.fromisoformat(cfg.end)
 
     # ------------------------------------------------------------------
     # 1. Ensure data is present (skip already-fetched days)
     # ------------------------------------------------------------------
-    is_mtf = args.granular_tf is not None
+    is_mtf = cfg.granular_tf is not None
 
     if is_mtf:
         # In MTF mode we only need the granular data — the signal TF
         # is resampled from it inside backtrader, so downloading signal-TF
         # CSVs would be wasteful (and they're never loaded).
-        print(f"[data] Ensuring {args.symbol} {args.granular_tf} data …")
-        collect(args.symbol, args.start, args.end, args.granular_tf, args.data_dir)
+        log.info(f"[data] Ensuring {cfg.symbol} {cfg.granular_tf} data …")
+        collect(cfg.symbol, cfg.start, cfg.end, cfg.granular_tf, cfg.data_dir)
     else:
-        print(f"[data] Ensuring {args.symbol} {args.signal_tf} data …")
-        collect(args.symbol, args.start, args.end, args.signal_tf, args.data_dir)
+        log.info(f"[data] Ensuring {cfg.symbol} {cfg.signal_tf} data …")
+        collect(cfg.symbol, cfg.start, cfg.end, cfg.signal_tf, cfg.data_dir)
 
     # ------------------------------------------------------------------
-    # 2. Load data into backtrader
+    # 2. Strategy (with optional param overrides)
     # ------------------------------------------------------------------
-    strategy_cls = _load_strategy(args.strategy)
+    strategy_cls = _load_strategy(cfg.strategy)
+    strat_kwargs = {}
 
-    cerebro = bt.Cerebro()
+    # MTF: single-TF strategies must use datas[1] for signals (not datas[0]).
+    # OversoldBounceMTFStrategy already uses datas[1]; others need target_data_index.
+    if is_mtf and hasattr(strategy_cls.params, "target_data_index"):
+        strat_kwargs["target_data_index"] = 1
+
+    # TP / SL shortcuts — only pass if the strategy declares the param
+    if cfg.tp is not None:
+        if hasattr(strategy_cls.params, "takeprofit_pct"):
+            strat_kwargs["takeprofit_pct"] = cfg.tp
+        else:
+            log.warning(f"[warn] --tp ignored: {strategy_cls.__name__} has no 'takeprofit_pct' param")
+    if cfg.sl is not None:
+        if hasattr(strategy_cls.params, "stoploss_pct"):
+            strat_kwargs["stoploss_pct"] = cfg.sl
+        else:
+            log.warning(f"[warn] --sl ignored: {strategy_cls.__name__} has no 'stoploss_pct' param")
+
+    # Generic --param KEY=VALUE overrides
+    for item in cfg.param:
+        key, sep, val = item.partition("=")
+        if not sep:
+            raise BacktestConfigError(f"Bad --param format '{item}', expected KEY=VALUE")
+        if not hasattr(strategy_cls.params, key):
+            raise BacktestConfigError(
+                f"Strategy {strategy_cls.__name__} has no param '{key}'. "
+                f"Declared params: {list(strategy_cls.params._getkeys())}")
+        strat_kwargs[key] = _cast_param(val)
+
+    if cfg.vectorized:
+        if is_mtf or not hasattr(strategy_cls, "vectorized_signals"):
+            log.warning(f"[warn] --vectorized ignored: {strategy_cls.__name__} has no "
+                        f"single-timeframe vectorized_signals(); using backtrader")
+        elif cfg.plot or cfg.plot_file:
+            log.warning("[warn] --vectorized ignored: charts need the backtrader "
+                        "run; using backtrader")
+        else:
+            return _run_vectorized(cfg, strategy_cls, strat_kwargs, start_dt, end_dt)
+
+    # ------------------------------------------------------------------
+    # 3. Load data into backtrader
+    # ------------------------------------------------------------------
+    # runonce/preload (backtrader's vectorised indicator pass) are spelled
+    # out because exactbars must stay 0: any non-zero value turns runonce
+    # off, and a positive one preload too.
+    # A strategy's _required_cerebro_opts override these defaults.
+    run_opts = dict(runonce=True, preload=True, exactbars=0)
+    run_opts.update(getattr(strategy_cls, "_required_cerebro_opts", {}))
+    exactbars = run_opts["exactbars"]
+    if exactbars and run_opts["runonce"] or exactbars > 0 and run_opts["preload"]:
+        raise BacktestConfigError(
+            f"{strategy_cls.__name__}._required_cerebro_opts: backtrader turns "
+            f"off runonce for any non-zero exactbars and preload for "
+            f"exactbars > 0 (got {run_opts})")
+
+    # The default Broker/BuySell/Trades observers only feed the chart.
+    plotting = bool(cfg.plot or cfg.plot_file)
+    cerebro = bt.Cerebro(stdstats=plotting, optreturn=True, **run_opts)
 
     if is_mtf:
         # Granular data (e.g. 1m) is datas[0]
-        bt_df_granular = load_bt_dataframe(args.symbol, args.granular_tf, args.data_dir)
+        bt_df = load_bt_dataframe(cfg.symbol, cfg.granular_tf, cfg.data_dir)
         data_granular = bt.feeds.PandasData(
-            dataname=bt_df_granular,
+            dataname=bt_df,
             fromdate=start_dt,
             todate=end_dt,
         )
         cerebro.adddata(data_granular)
 
         # Resample to signal timeframe -> datas[1]
-        tf, comp = _parse_tf(args.signal_tf)
+        tf, comp = _parse_tf(cfg.signal_tf)
         cerebro.resampledata(data_granular, timeframe=tf, compression=comp)
     else:
-        bt_df = load_bt_dataframe(args.symbol, args.signal_tf, args.data_dir)
+        bt_df = load_bt_dataframe(cfg.symbol, cfg.signal_tf, cfg.data_dir)
         cerebro.adddata(bt.feeds.PandasData(
             dataname=bt_df,
             fromdate=start_dt,
             todate=end_dt,
         ))
 
-    # ------------------------------------------------------------------
-    # 3. Strategy (with optional param overrides)
-    # ------------------------------------------------------------------
-    strat_kwargs = {}
-
-    # MTF: single-TF strategies must use datas[1] for signals (not datas[0]).
-    # OversoldBounceMTFStrategy already uses datas[1]; others need target_data_index.
-    if is_mtf and hasattr(strategy_cls.params, "target_data_index"):
-        strat_kwargs["target_data_index"] = 1
-
-    # TP / SL shortcuts — only pass if the strategy declares the param
-    if args.tp is not None:
-        if hasattr(strategy_cls.params, "takeprofit_pct"):
-            strat_kwargs["takeprofit_pct"] = args.tp
-        else:
-            print(f"[warn] --tp ignored: {strategy_cls.__name__} has no 'takeprofit_pct' param")
-    if args.sl is not None:
-        if hasattr(strategy_cls.params, "stoploss_pct"):
-            strat_kwargs["stoploss_pct"] = args.sl
-        else:
-            print(f"[warn] --sl ignored: {strategy_cls.__name__} has no 'stoploss_pct' param")
-
-    # Generic --param KEY=VALUE overrides
-    for item in args.param:
-        if "=" not in item:
-            sys.exit(f"Bad --param format '{item}', expected KEY=VALUE")
-        key, val = item.split("=", 1)
-        if not hasattr(strategy_cls.params, key):
-            sys.exit(f"Strategy {strategy_cls.__name__} has no param '{key}'. "
-                     f"Declared params: {list(strategy_cls.params._getkeys())}")
-        # Auto-cast: bool, int, float, else string
-        v_lower = val.strip().lower()
-        if v_lower in ("true", "yes", "1"):
-            val = True
-        elif v_lower in ("false", "no", "0"):
-            val = False
-        else:
-            try:
-                val = int(val)
-            except ValueError:
-                try:
-                    val = float(val)
-                except ValueError:
-                    pass  # keep as string
-        strat_kwargs[key] = val
+    # Only the bar count is needed later (plot guard); don't keep the
+    # frame alive in this scope for the rest of the run.
+    n_bars = len(bt_df)
+    del bt_df
 
     cerebro.addstrategy(strategy_cls, **strat_kwargs)
 
     # ------------------------------------------------------------------
     # 4. Broker config
     # ------------------------------------------------------------------
-    cerebro.broker.setcash(args.cash)
-    if args.slippage > 0:
-        cerebro.broker.set_slippage_perc(args.slippage, slip_open=True,
+    cerebro.broker.setcash(cfg.cash)
+    if cfg.slippage > 0:
+        cerebro.broker.set_slippage_perc(cfg.slippage, slip_open=True,
                                           slip_limit=False, slip_match=True,
                                           slip_out=False)
-    comminfo = BinanceFuturesCommInfo(
-        commission_maker=args.commission_maker,
-        commission_taker=args.commission_taker,
-        commission_type=args.commission_type,
-        margin=1 / args.leverage,
-    )
-    cerebro.broker.addcommissioninfo(comminfo)
+    cerebro.broker.addcommissioninfo(make_comminfo(cfg))
     cerebro.addsizer(
         bt.sizers.PercentSizer,
-        percents=args.position_pct * args.leverage * 100,
+        percents=cfg.position_pct * cfg.leverage * 100,
     )
 
     # ------------------------------------------------------------------
     # 5. Analyzers
     # ------------------------------------------------------------------
     cerebro.addanalyzer(bt.analyzers.TradeAnalyzer, _name="trades")
-    tf, comp = _parse_tf(args.signal_tf)
-    sharpe_factor = _TF_SHARPE_FACTOR.get(args.signal_tf, 252)
+    tf, comp = _parse_tf(cfg.signal_tf)
+    sharpe_factor = _TF_SHARPE_FACTOR.get(cfg.signal_tf, 252)
     cerebro.addanalyzer(
         bt.analyzers.SharpeRatio,
         _name="sharpe",
@@ -328,19 +490,7 @@ def main():
     # 6. Run
     # ------------------------------------------------------------------
     start_val = cerebro.broker.getvalue()
-    print(f"\n{'='*50}")
-    print(f" Symbol      : {args.symbol}")
-    print(f" Period       : {args.start} → {args.end}")
-    print(f" Signal TF    : {args.signal_tf}")
-    if is_mtf:
-        print(f" Granular TF  : {args.granular_tf}")
-    print(f" Strategy     : {args.strategy}")
-    if strat_kwargs:
-        print(f" Params       : {strat_kwargs}")
-    print(f" Leverage     : {args.leverage}x")
-    print(f" Slippage     : {args.slippage*100:.3f}%")
-    print(f" Starting cash: ${start_val:,.2f}")
-    print(f"{'='*50}\n")
+    _log_banner(cfg, strat_kwargs, start_val)
 
     results = cerebro.run()
     strat = results[0]
@@ -350,56 +500,128 @@ def main():
     # 7. Report
     # ------------------------------------------------------------------
     ta = strat.analyzers.trades.get_analysis()
-    total = ta.get("total", {}).get("total", 0) or 0
-    won = ta.get("won", {}).get("total", 0) or 0
-    lost = ta.get("lost", {}).get("total", 0) or 0
-    win_rate = (won / total * 100) if total > 0 else 0.0
-    total_return = (end_val - start_val) / start_val * 100
-
     dd = strat.analyzers.drawdown.get_analysis()
-    max_dd = dd.get("max", {}).get("drawdown", 0) or 0
-
     sharpe = strat.analyzers.sharpe.get_analysis()
-    sharpe_ratio = sharpe.get("sharperatio", None)
-    sharpe_str = f"{sharpe_ratio:.3f}" if sharpe_ratio is not None else "N/A"
-
-    print(f"\n{'='*50}")
-    print(f" RESULTS")
-    print(f"{'='*50}")
-    print(f" Ending cash   : ${end_val:,.2f}")
-    print(f" Total return  : {total_return:+.2f}%")
-    print(f" Trades        : {total}  (won {won} / lost {lost})")
-    print(f" Win rate      : {win_rate:.1f}%")
-    print(f" Max drawdown  : {max_dd:.2f}%")
-    print(f" Sharpe ratio  : {sharpe_str}")
-    print(f"{'='*50}\n")
+    result = _make_result(
+        start_val, end_val, strat_kwargs,
+        total=ta.get("total", {}).get("total", 0) or 0,
+        won=ta.get("won", {}).get("total", 0) or 0,
+        lost=ta.get("lost", {}).get("total", 0) or 0,
+        max_dd=dd.get("max", {}).get("drawdown", 0) or 0,
+        sharpe_ratio=sharpe.get("sharperatio", None),
+    )
+    _log_results(result)
 
     # ------------------------------------------------------------------
     # 8. Plot (optional)
     # ------------------------------------------------------------------
     PLOT_BAR_LIMIT = 50_000  # 1m data for ~35 days; avoid OOM/freeze
 
-    if args.plot or args.plot_file:
-        n_bars = len(bt_df_granular) if is_mtf else len(bt_df)
+    if plotting:
         if n_bars > PLOT_BAR_LIMIT:
-            print(f"[warn] Skipping plot: {n_bars:,} bars exceeds limit ({PLOT_BAR_LIMIT:,}). "
-                  f"Use a shorter date range or omit --plot/--plot-file.")
+            log.warning(f"[warn] Skipping plot: {n_bars:,} bars exceeds limit ({PLOT_BAR_LIMIT:,}). "
+                        f"Use a shorter date range or omit --plot/--plot-file.")
         else:
             import matplotlib
-            if args.plot_file and not args.plot:
+            if cfg.plot_file and not cfg.plot:
                 matplotlib.use("Agg")
             import matplotlib.pyplot as plt
 
             plt.rcParams["figure.figsize"] = [15, 12]
             figs = cerebro.plot(iplot=False)
-            if args.plot_file:
+            if cfg.plot_file:
                 for figlist in figs:
                     for fig in figlist:
-                        fig.savefig(args.plot_file, dpi=150, bbox_inches="tight")
-                        print(f"Chart saved to {args.plot_file}")
-            if args.plot:
+                        fig.savefig(cfg.plot_file, dpi=150, bbox_inches="tight")
+                        log.info(f"Chart saved to {cfg.plot_file}")
+            if cfg.plot:
                 plt.show()
 
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run a backtrader backtest with Binance Vision data",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+
+    # Data / collection
+    parser.add_argument("--symbol", required=True, help="Trading pair, e.g. ETHUSDT")
+    parser.add_argument("--start", required=True, help="Start date YYYY-MM-DD (inclusive)")
+    parser.add_argument("--end", required=True, help="End date YYYY-MM-DD (exclusive)")
+    parser.add_argument("--data-dir", default="Data", help="Local data cache directory (default: Data)")
+
+    # Timeframes
+    parser.add_argument(
+        "--signal-tf", required=True,
+        help="Timeframe for signal generation / single-TF strategies (e.g. 15m, 1h)",
+    )
+    parser.add_argument(
+        "--granular-tf", default=None,
+        help="Optional finer timeframe for TP/SL execution in MTF mode (e.g. 1m). "
+             "When set, data is loaded at this TF and resampled to --signal-tf.",
+    )
+
+    # Strategy
+    parser.add_argument(
+        "--strategy", required=True,
+        help="Dotted path to a bt.Strategy class (e.g. strategies.MAStrategy)",
+    )
+
+    # Strategy parameters (TP / SL shortcuts + generic --param)
+    parser.add_argument("--tp", type=float, default=None,
+                        help="Take-profit %% as decimal (e.g. 0.015 = 1.5%%). "
+                             "Passed to strategy as takeprofit_pct.")
+    parser.add_argument("--sl", type=float, default=None,
+                        help="Stop-loss %% as decimal (e.g. 0.006 = 0.6%%). "
+                             "Passed to strategy as stoploss_pct.")
+    parser.add_argument("--param", action="append", default=[], metavar="KEY=VALUE",
+                        help="Arbitrary strategy param, e.g. --param rsi_period=10. "
+                             "Numeric values are auto-cast. Can be repeated.")
+
+    # Broker
+    parser.add_argument("--cash", type=float, default=10_000, help="Starting cash (default: 10000)")
+    parser.add_argument("--leverage", type=float, default=5, help="Leverage multiplier (default: 5)")
+    parser.add_argument("--position-pct", type=float, default=0.95,
+                        help="Fraction of equity per trade (default: 0.95)")
+    parser.add_argument("--commission-maker", type=float, default=0.0002,
+                        help="Maker commission rate (default: 0.0002)")
+    parser.add_argument("--commission-taker", type=float, default=0.0005,
+                        help="Taker commission rate (default: 0.0005)")
+    parser.add_argument("--commission-type", default="taker",
+                        choices=["maker", "taker", "blended"],
+                        help="Commission type (default: taker)")
+
+    # Slippage
+    parser.add_argument("--slippage", type=float, default=0.0001,
+                        help="Slippage per trade as fraction of price (default: 0.0001 = 0.01%%). "
+                             "Set to 0 for ideal fills.")
+
+    # Engine
+    parser.add_argument("--vectorized", action="store_true",
+                        help="Use the strategy's NumPy vectorized_signals() replay instead of "
+                             "backtrader (single-TF, no chart; falls back to backtrader otherwise). "
+                             "Approximate: no margin calls / order rejections.")
+
+    # Output
+    parser.add_argument("--plot", action="store_true", help="Show backtrader chart after run")
+    parser.add_argument("--plot-file", default=None,
+                        help="Save chart to this file (e.g. result.png)")
+
+    args = parser.parse_args()
+
+    logging.basicConfig(format="%(message)s", stream=sys.stdout)
+    log.setLevel(logging.INFO)
+    try:
+        run_backtest(BacktestConfig(**vars(args)))
+    except BacktestConfigError as exc:
+        sys.exit(str(exc))
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,26 @@
+"""
+Ahead-of-time compile the numba kernels in kernels.py.
+
+    python build_aot.py
+
+writes a ``kernels_aot`` extension module next to this file.  kernels.py
+imports it in preference to the JIT versions, so one-off CLI backtests
+skip numba's compile step (hundreds of ms per kernel on a cold cache).
+Re-run after changing a kernel; delete the built module to go back to JIT.
+"""
+
+import os
+
+from numba.pycc import CC
+
+from kernels import JIT_KERNELS, SIGNATURES
+
+cc = CC("kernels_aot")
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+for kernel in JIT_KERNELS:
+    cc.export(kernel.__name__, SIGNATURES[kernel.__name__])(kernel.py_func)
+
+
+if __name__ == "__main__":
+    cc.compile()
+    print(f"Built kernels_aot in {cc.output_dir}")
@@ -6,12 +6,28 @@ them locally so they are never re-fetched once present on disk.
 """
 
 import glob
+import hashlib
+import io
+import multiprocessing
 import os
-import shutil
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import date, timedelta
+from functools import lru_cache
 
+import numpy as np
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:  # optional: multi-threaded CSV parsing (pandas is used otherwise)
+    import pyarrow as pa
+    from pyarrow import csv as pacsv
+except ImportError:
+    pa = pacsv = None
 
 COLUMNS = [
     "open_time", "open", "high", "low", "close", "volume",
@@ -19,26 +35,182 @@ COLUMNS = [
     "taker_buy_base_asset_volume", "taker_buy_quote_asset_volume", "ignore",
 ]
 
-NUMERIC_COLS = ["open", "high", "low", "close", "volume",
-                "quote_asset_volume", "taker_buy_base_asset_volume",
-                "taker_buy_quote_asset_volume"]
+# Declared up front so read_csv parses and converts in a single C pass
+DTYPES = {
+    "open_time": "int64", "open": "float64", "high": "float64",
+    "low": "float64", "close": "float64", "volume": "float64",
+    "close_time": "int64", "quote_asset_volume": "float64",
+    "number_of_trades": "int64", "taker_buy_base_asset_volume": "float64",
+    "taker_buy_quote_asset_volume": "float64", "ignore": "float64",
+}
 
 BASE_URL = "https://data.binance.vision/data/spot/daily/klines"
 
+# Daily downloads are independent and network-bound, so they are fetched
+# concurrently over a shared keep-alive session.
+DOWNLOAD_WORKERS = 16
+
+# Bump when the cached frame's schema changes so stale Parquet is ignored.
+_CACHE_VERSION = 2
+
+# Below this many files, pool start-up costs more than parsing serially.
+PARSE_PARALLEL_MIN_FILES = 8
+
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,  # >= DOWNLOAD_WORKERS so every worker keeps its socket
+    max_retries=Retry(total=3, backoff_factor=0.5,
+                      status_forcelist=[429, 500, 502, 503, 504]),
+))
+_PRINT_LOCK = threading.Lock()
+
 
 def _parse_date(s: str) -> date:
-    parts = s.split("-")
-    return date(int(parts[0]), int(parts[1]), int(parts[2]))
+    return date.fromisoformat(s)
 
 
 def _format_date(d: date) -> str:
-    return f"{d.year}-{d.month:02d}-{d.day:02d}"
+    return d.isoformat()
 
 
 def _csv_path(symbol: str, interval: str, day: str, data_dir: str) -> str:
     return os.path.join(data_dir, f"{symbol}-{interval}-{day}.csv")
 
 
+def _has_header(path: str) -> bool:
+    """Some Binance Vision dumps start with a column-name row; detect it."""
+    with open(path, "rb") as f:
+        first = f.read(1)
+    return bool(first) and not first.isdigit()
+
+
+def _read_csv(path: str) -> pd.DataFrame:
+    return pd.read_csv(
+        path,
+        names=COLUMNS,
+        header=0 if _has_header(path) else None,
+        dtype=DTYPES,
+        engine="c",
+    )
+
+
+def _read_arrow(path: str) -> "pa.Table":
+    return pacsv.read_csv(
+        path,
+        read_options=pacsv.ReadOptions(
+            column_names=COLUMNS,
+            skip_rows=1 if _has_header(path) else 0,
+        ),
+        convert_options=pacsv.ConvertOptions(
+            column_types={c: pa.from_numpy_dtype(np.dtype(t)) for c, t in DTYPES.items()},
+        ),
+    )
+
+
+def _count_rows(path: str) -> int:
+    """Upper bound on data rows in *path* (newline count at near-disk speed)."""
+    with open(path, "rb") as f:
+        rows = sum(chunk.count(b"\n") for chunk in iter(lambda: f.read(1 << 20), b""))
+        if f.tell() == 0:
+            return 0
+        f.seek(-1, os.SEEK_END)
+        return rows + (f.read(1) != b"\n")
+
+
+def _read_all(files: list) -> pd.DataFrame:
+    """
+    Parse and concatenate *files*, via Arrow tables when pyarrow is present.
+
+    Larger file sets are parsed in parallel: pyarrow releases the GIL, so
+    a thread pool suffices; the pandas fallback needs worker processes,
+    and parses serially inside a daemonic worker (e.g. a
+    ``multiprocessing.Pool`` sweep), which may not start children — its
+    siblings keep the cores busy anyway.
+    Each parsed file is copied straight into columns preallocated from a
+    row count, so there is no list-of-frames + concat copy at the end.
+    """
+    parallel = len(files) >= PARSE_PARALLEL_MIN_FILES
+    if pacsv is not None:
+        reader, pool = _read_arrow, ThreadPoolExecutor
+    else:
+        reader, pool = _read_csv, ProcessPoolExecutor
+        parallel = parallel and not multiprocessing.current_process().daemon
+
+    capacity = sum(_count_rows(f) for f in files)
+    arrs = {c: np.empty(capacity, dtype=DTYPES[c]) for c in COLUMNS}
+
+    def _fill(parsed) -> int:
+        offset = 0
+        for frame in parsed:
+            n = len(frame)
+            for c in COLUMNS:
+                arrs[c][offset:offset + n] = frame[c].to_numpy()
+            offset += n
+        return offset
+
+    if parallel:
+        with pool(max_workers=os.cpu_count()) as ex:
+            rows = _fill(ex.map(reader, files, chunksize=4))
+    else:
+        rows = _fill(map(reader, files))
+
+    # Header and blank lines are counted by _count_rows; trim the slack
+    return pd.DataFrame({c: a[:rows] for c, a in arrs.items()}, copy=False)
+
+
+def _cache_path(symbol: str, interval: str, files: list, data_dir: str) -> str:
+    """
+    Parquet cache location for the concatenated *files*.
+
+    The key fingerprints the file names and their mtimes, so adding a new
+    day (or re-downloading one) produces a fresh cache entry.
+    """
+    fingerprint = (
+        f"v{_CACHE_VERSION}|" + "|".join(files)
+        + str(sum(os.path.getmtime(f) for f in files))
+    )
+    key = hashlib.sha1(fingerprint.encode()).hexdigest()[:16]
+    return os.path.join(data_dir, "_cache", f"{symbol}-{interval}-{key}.parquet")
+
+
+def _write_cache(df: pd.DataFrame, cache_path: str, symbol: str, interval: str) -> None:
+    """
+    Write *df* to *cache_path* and prune stale entries for the same pair.
+
+    Safe against concurrent loads (e.g. a ``multiprocessing.Pool`` sweep):
+    the file is written under a temporary name and renamed into place, so
+    readers never see a partial file, and pruning tolerates entries
+    another process already removed.
+    """
+    try:
+        data = df.to_parquet(compression="zstd")
+    except ImportError:
+        return  # no parquet engine installed — run uncached
+    cache_dir = os.path.dirname(cache_path)
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, cache_path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+    for old in glob.glob(os.path.join(cache_dir, f"{symbol}-{interval}-*.parquet")):
+        if old != cache_path:
+            try:
+                os.remove(old)
+            except FileNotFoundError:
+                pass  # pruned by a concurrent load
+
+
+def _time_scale(x) -> int:
+    """Multiplier taking an epoch value in s / ms / us to microseconds."""
+    # >1e15 → already microseconds, >1e12 → milliseconds, else seconds
+    return 1 if x > 1e15 else (1_000 if x > 1e12 else 1_000_000)
+
+
 def _normalize_open_time(series: "pd.Series") -> "pd.Series":
     """
     Normalise ``open_time`` values to **microseconds** regardless of
@@ -48,17 +220,37 @@ def _normalize_open_time(series: "pd.Series") -> "pd.Series":
     Binance Vision CSV dumps are *not* consistent across symbols and
     time ranges — some files use milliseconds (13 digits) while others
     use microseconds (16 digits).  This per-value normalisation handles
-    any mix safely.
+    any mix safely.  The result is exact ``int64``.
+
+    In practice a whole load usually shares one unit: when the smallest
+    and largest values map to the same scale, a single scalar multiply
+    is used instead of the per-row path.
     """
-    s = pd.to_numeric(series, errors="coerce")
-    # >1e15 → already microseconds, >1e12 → milliseconds, else seconds
-    us_mask = s > 1e15
-    ms_mask = (s > 1e12) & ~us_mask
-    s_mask = ~us_mask & ~ms_mask
-    s = s.copy()
-    s.loc[ms_mask] = s.loc[ms_mask] * 1_000        # ms → us
-    s.loc[s_mask] = s.loc[s_mask] * 1_000_000      # s  → us
-    return s
+    v = pd.to_numeric(series, errors="coerce").to_numpy()
+    if len(v) and _time_scale(v.min()) == _time_scale(v.max()):
+        mult = _time_scale(v.min())
+    else:
+        mult = np.where(v > 1e15, 1, np.where(v > 1e12, 1_000, 1_000_000))
+    return pd.Series((v * mult).astype("int64"), index=series.index, name=series.name)
+
+
+def _fetch_one(job) -> None:
+    """Download and unpack one daily ZIP; *job* is (day, url, csv, data_dir)."""
+    day_str, url, csv, data_dir = job
+
+    # Re-check inside the worker in case a concurrent run already fetched it
+    if os.path.isfile(csv):
+        return
+
+    try:
+        r = _SESSION.get(url, verify=False, allow_redirects=True, timeout=30)
+        r.raise_for_status()
+        # Extract straight from memory — no temporary .zip on disk
+        with zipfile.ZipFile(io.BytesIO(r.content)) as zf:
+            zf.extractall(data_dir)
+    except Exception as exc:
+        with _PRINT_LOCK:
+            print(f"  [warn] {day_str}: {exc}")
 
 
 def collect(
@@ -72,89 +264,131 @@ def collect(
     Download klines CSVs from Binance Vision for *symbol* at *interval*
     between *start_date* and *end_date* (YYYY-MM-DD, end exclusive).
 
-    Already-downloaded CSVs are skipped automatically.
+    Already-downloaded CSVs are skipped automatically; missing days are
+    fetched in parallel (``DOWNLOAD_WORKERS`` threads).
     """
     os.makedirs(data_dir, exist_ok=True)
 
     current = _parse_date(start_date)
     end = _parse_date(end_date)
 
+    # One directory listing instead of a stat() per day on the cache-hit path
+    present = set(os.listdir(data_dir))
+
+    jobs = []
     while current < end:
         day_str = _format_date(current)
-        csv = _csv_path(symbol, interval, day_str, data_dir)
 
-        if not os.path.isfile(csv):
+        if f"{symbol}-{interval}-{day_str}.csv" not in present:
+            csv = _csv_path(symbol, interval, day_str, data_dir)
             zip_name = f"{symbol}-{interval}-{day_str}.zip"
-            zip_path = os.path.join(data_dir, zip_name)
             url = f"{BASE_URL}/{symbol}/{interval}/{zip_name}"
-
-            try:
-                r = requests.get(url, verify=False, allow_redirects=True, timeout=30)
-                r.raise_for_status()
-                with open(zip_path, "wb") as f:
-                    f.write(r.content)
-                shutil.unpack_archive(zip_path, data_dir)
-            except Exception as exc:
-                print(f"  [warn] {day_str}: {exc}")
-            finally:
-                if os.path.isfile(zip_path):
-                    os.remove(zip_path)
+            jobs.append((day_str, url, csv, data_dir))
         current += timedelta(days=1)
 
+    if not jobs:
+        return
 
-def load(
-    symbol: str,
-    interval: str,
-    data_dir: str = "Data",
-) -> pd.DataFrame:
-    """
-    Load all cached klines CSVs for *symbol*/*interval* from *data_dir* into a
-    single sorted DataFrame with proper column names.
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as ex:
+        list(ex.map(_fetch_one, jobs))
 
-    Duplicates (by ``open_time``) are dropped and OHLCV columns are
-    coerced to numeric so downstream code never gets string values.
-    """
+
+def _locate(symbol: str, interval: str, data_dir: str):
+    """Return (files, parquet cache path) for *symbol*/*interval*."""
     pattern = os.path.join(data_dir, f"{symbol}-{interval}-*.csv")
     files = sorted(glob.glob(pattern))
     if not files:
         raise FileNotFoundError(
             f"No data found for {symbol} {interval} in {data_dir}"
         )
-    dfs = [pd.read_csv(f, names=COLUMNS) for f in files]
+    return tuple(files), _cache_path(symbol, interval, files, data_dir)
+
+
+# In-process memo keyed by the file-set fingerprint (via the cache path),
+# so repeated loads in a parameter sweep skip parsing entirely while new
+# or re-downloaded CSVs still invalidate it.
+@lru_cache(maxsize=8)
+def _load(symbol: str, interval: str, files: tuple, cache_path: str) -> pd.DataFrame:
+    try:
+        return pd.read_parquet(cache_path)
+    except (ImportError, OSError, ValueError):
+        pass  # no cache yet, no parquet engine, or an unreadable file: re-parse
+
     df = (
-        pd.concat(dfs, ignore_index=True)
+        _read_all(list(files))
         .drop_duplicates(subset=["open_time"])
         .sort_values("open_time")
         .reset_index(drop=True)
     )
 
-    # Ensure OHLCV columns are numeric (guards against mixed-type CSVs)
-    for col in NUMERIC_COLS:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
-
     # Normalise open_time to microseconds so all downstream code can
     # use a single unit regardless of the source CSV format.
     df["open_time"] = _normalize_open_time(df["open_time"])
 
+    _write_cache(df, cache_path, symbol, interval)
     return df
 
 
+@lru_cache(maxsize=8)
+def _load_bt(
+    symbol: str, interval: str, files: tuple, cache_path: str, dtype: str,
+) -> pd.DataFrame:
+    df = _load(symbol, interval, files, cache_path)
+    dt_index = pd.to_datetime(df["open_time"].to_numpy(), unit="us")
+
+    bt_df = pd.DataFrame(
+        {c: df[c].to_numpy(dtype=dtype)
+         for c in ("open", "high", "low", "close", "volume")},
+        index=dt_index,
+    )
+    bt_df.index.name = "datetime"
+    return bt_df
+
+
+def cache_clear() -> None:
+    """Drop the in-process memo used by ``load``/``load_bt_dataframe``."""
+    _load.cache_clear()
+    _load_bt.cache_clear()
+
+
+def load(
+    symbol: str,
+    interval: str,
+    data_dir: str = "Data",
+) -> pd.DataFrame:
+    """
+    Load all cached klines CSVs for *symbol*/*interval* from *data_dir* into a
+    single sorted DataFrame with proper column names.
+
+    Duplicates (by ``open_time``) are dropped; columns are parsed with
+    the explicit ``DTYPES`` so downstream code never gets string values.
+
+    The result is cached as Parquet under ``<data_dir>/_cache`` and reused
+    while the set of CSVs is unchanged (requires a Parquet engine such as
+    pyarrow; without one every call re-parses the CSVs).  It is also
+    memoised in-process, so the returned frame is shared between callers
+    and must be treated as read-only.
+    """
+    return _load(symbol, interval, *_locate(symbol, interval, data_dir))
+
+
 def load_bt_dataframe(
     symbol: str,
     interval: str,
     data_dir: str = "Data",
+    dtype: str = "float64",
 ) -> pd.DataFrame:
     """
     Convenience: load klines and return a DataFrame ready for
     ``bt.feeds.PandasData`` (datetime index, OHLCV columns).
 
-    ``load()`` already normalises ``open_time`` to microseconds, so a
-    single ``unit='us'`` conversion is safe here.
-    """
-    df = load(symbol, interval, data_dir)
-    df["datetime"] = pd.to_datetime(df["open_time"], unit="us")
+    ``load()`` already normalises ``open_time`` to int64 microseconds, so
+    a single ``unit='us'`` conversion is exact here.  Like ``load()`` the
+    result is memoised and must be treated as read-only (backtrader only
+    reads it).
 
-    bt_df = df[["open", "high", "low", "close", "volume"]].copy()
-    bt_df.index = df["datetime"]
-    bt_df.index.name = "datetime"
-    return bt_df
+    Pass ``dtype="float32"`` to halve the frame's memory on very long 1m
+    ranges.  Prices are then rounded to ~7 significant digits (about 0.01
+    on a 100k BTC price), which can move TP/SL fills, so it is opt-in.
+    """
+    return _load_bt(symbol, interval, *_locate(symbol, interval, data_dir), dtype)
@@ -0,0 +1,43 @@
+"""Shared pytest fixtures: a synthetic Binance Vision data directory."""
+
+import os
+
+import numpy as np
+import pytest
+
+import collector
+
+SYMBOL = "TESTUSDT"
+START, END = "2025-01-01", "2025-01-05"  # end exclusive, as on the CLI
+_DAYS = 4
+_BARS_PER_DAY = 24 * 60
+
+
+@pytest.fixture(scope="session")
+def data_dir(tmp_path_factory):
+    """
+    Daily 1m klines CSVs for ``SYMBOL`` from ``START`` to ``END``: a seeded
+    random walk, laid out like ``collector.collect`` leaves them so no
+    download is attempted.
+    """
+    path = tmp_path_factory.mktemp("Data")
+    rng = np.random.default_rng(7)
+    n = _DAYS * _BARS_PER_DAY
+    close = 3000 * np.exp(np.cumsum(rng.normal(0, 0.0015, n)))
+    open_ = np.r_[close[0], close[:-1]]
+    spread = np.abs(rng.normal(0, 0.001, n)) * close
+    high = np.maximum(open_, close) + spread
+    low = np.minimum(open_, close) - spread
+    start_ms = int(np.datetime64(START, "ms").astype(np.int64))
+    open_time = start_ms + np.arange(n, dtype=np.int64) * 60_000
+
+    for d in range(_DAYS):
+        day = str(np.datetime64(START) + d)
+        rows = slice(d * _BARS_PER_DAY, (d + 1) * _BARS_PER_DAY)
+        with open(os.path.join(path, f"{SYMBOL}-1m-{day}.csv"), "w") as f:
+            for t, o, h, l, c in zip(*(a[rows].tolist() for a in
+                                       (open_time, open_, high, low, close))):
+                f.write(f"{t},{o!r},{h!r},{l!r},{c!r},1.0,{t + 59_999},"
+                        f"{c!r},1,0.5,{c / 2!r},0\n")
+    yield str(path)
+    collector.cache_clear()
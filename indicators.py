@@ -0,0 +1,261 @@
+"""
+Drop-in replacements for the backtrader indicators the strategies use.
+
+backtrader computes SMA, RSI and Bollinger Bands through chains of small
+Python sub-indicators.  The classes here expose the same lines but fill
+them in one compiled pass per run (``oncestart()``, used with runonce/preload)
+via the kernels in ``kernels.py``.  ``next()`` keeps the per-bar path for
+runs where backtrader steps bar by bar (e.g. ``exactbars`` set).
+
+Kernel outputs are memoised on the input's contents and parameters, so
+repeated runs over the same data in one process (parameter sweeps, where
+most trials share e.g. ``rsi_period`` or ``trend_ma``) skip the
+computation entirely.
+"""
+
+import hashlib
+import math
+import threading
+from collections import OrderedDict
+
+import backtrader as bt
+import numpy as np
+
+from kernels import bollinger, oversold_indicators, rolling_mean, wilder_rsi
+
+# Entries hold one or three float64 arrays the length of the data: a year
+# of 1m bars is ~4.2 MB per array, ~12.6 MB for a FastIndicators entry.
+# The memo lives as long as the (sweep) process, so it is bounded by the
+# total size of its arrays rather than by entry count; least recently
+# used entries go first.
+_CACHE_MAX_BYTES = 128 << 20
+_CACHE = OrderedDict()  # key -> (output, nbytes)
+_CACHE_BYTES = 0
+_CACHE_LOCK = threading.Lock()
+
+
+def _cached(kernel, src, *args):
+    """
+    ``kernel(src, *args)``, memoised on a digest of *src*'s bytes.
+
+    Keyed on content rather than ``id()``: line buffers are rebuilt every
+    run, and ids of freed arrays get reused.  Results are shared, so they
+    are returned read-only.
+    """
+    global _CACHE_BYTES
+    key = (kernel.__name__, hashlib.sha1(src).digest(), args)
+    with _CACHE_LOCK:
+        entry = _CACHE.get(key)
+        if entry is not None:
+            _CACHE.move_to_end(key)
+            return entry[0]
+
+    out = kernel(src, *args)
+    arrays = out if isinstance(out, tuple) else (out,)
+    for arr in arrays:
+        arr.flags.writeable = False
+    nbytes = sum(arr.nbytes for arr in arrays)
+    if nbytes > _CACHE_MAX_BYTES:
+        return out  # would evict everything else and still not fit
+    with _CACHE_LOCK:
+        if key not in _CACHE:  # another thread may have stored it meanwhile
+            _CACHE[key] = (out, nbytes)
+            _CACHE_BYTES += nbytes
+        while _CACHE_BYTES > _CACHE_MAX_BYTES:
+            _CACHE_BYTES -= _CACHE.popitem(last=False)[1][1]
+    return out
+
+
+def cache_clear() -> None:
+    """Drop the in-process memo of indicator outputs."""
+    global _CACHE_BYTES
+    with _CACHE_LOCK:
+        _CACHE.clear()
+        _CACHE_BYTES = 0
+
+
+def _as_array(line, end):
+    """Writable float64 view of a line's backing ``array('d')`` up to *end*."""
+    return np.frombuffer(line.array, dtype=np.float64)[:end]
+
+
+class _OnePassMixin:
+    """
+    backtrader runs ``oncestart(minperiod - 1, minperiod)`` and then
+    ``once(minperiod, buflen)``.  Calling the kernel for the one-bar range
+    would compute (and memoise) a throwaway prefix, so ``oncestart`` fills
+    every bar from ``minperiod - 1`` on via ``_fill`` and ``once`` has
+    nothing left to do.
+    """
+
+    def oncestart(self, start, end):
+        self._fill(start, self.buflen())
+
+    def once(self, start, end):
+        pass
+
+
+class FastSMA(_OnePassMixin, bt.Indicator):
+    """Simple moving average; same ``sma`` line as ``bt.indicators.SMA``."""
+    alias = ("FastSimpleMovingAverage",)
+    lines = ("sma",)
+    params = (("period", 30),)
+    plotinfo = dict(subplot=False)
+
+    def __init__(self):
+        self.addminperiod(self.p.period)
+
+    def next(self):
+        self.lines.sma[0] = math.fsum(self.data.get(size=self.p.period)) / self.p.period
+
+    def _fill(self, start, end):
+        out = _cached(rolling_mean, _as_array(self.data, end), self.p.period)
+        _as_array(self.lines.sma, end)[start:end] = out[start:end]
+
+
+class _WilderRSIMixin:
+    """Per-bar Wilder RSI of ``self.data`` for the ``next()`` paths."""
+
+    def _rsi_init(self, period, safehigh, safelow):
+        self._rsi_params = (period, safehigh, safelow)
+        self._alpha = 1.0 / period
+        self._alpha1 = 1.0 - self._alpha
+
+    def _rsi_next(self):
+        """RSI at the current bar; call for every bar from ``period + 1`` on."""
+        period, safehigh, safelow = self._rsi_params
+        if len(self) == period + 1:
+            # Seed: simple mean of the first period moves
+            prices = self.data.get(size=period + 1)
+            moves = [b - a for a, b in zip(prices[:-1], prices[1:])]
+            self._len = len(self)
+            self._maup = math.fsum(max(m, 0.0) for m in moves) / period
+            self._madown = math.fsum(max(-m, 0.0) for m in moves) / period
+        else:
+            # next() is re-run for the same bar when the indicator sits on
+            # a slower (resampled) feed, so smooth from the previous bar's
+            # averages rather than the last computed ones
+            if len(self) != self._len:
+                self._len = len(self)
+                self._prev = (self._maup, self._madown)
+            maup, madown = self._prev
+            move = self.data[0] - self.data[-1]
+            self._maup = maup * self._alpha1 + max(move, 0.0) * self._alpha
+            self._madown = madown * self._alpha1 + max(-move, 0.0) * self._alpha
+        if self._madown != 0.0:
+            return 100.0 - 100.0 / (1.0 + self._maup / self._madown)
+        return safehigh if self._maup != 0.0 else safelow
+
+
+class FastRSI(_OnePassMixin, _WilderRSIMixin, bt.Indicator):
+    """
+    Wilder RSI; same ``rsi`` line as ``bt.indicators.RSI``.
+
+    Division by a zero average loss returns ``safehigh``/``safelow``
+    instead of raising, i.e. it always behaves like ``safediv=True``.
+    """
+    lines = ("rsi",)
+    params = (
+        ("period", 14),
+        ("upperband", 70.0),
+        ("lowerband", 30.0),
+        ("safehigh", 100.0),
+        ("safelow", 50.0),
+    )
+
+    def _plotinit(self):
+        self.plotinfo.plotyhlines = [self.p.upperband, self.p.lowerband]
+
+    def __init__(self):
+        self.addminperiod(self.p.period + 1)
+        self._rsi_init(self.p.period, self.p.safehigh, self.p.safelow)
+
+    def next(self):
+        self.lines.rsi[0] = self._rsi_next()
+
+    def _fill(self, start, end):
+        out = _cached(wilder_rsi, _as_array(self.data, end), self.p.period,
+                      float(self.p.safehigh), float(self.p.safelow))
+        _as_array(self.lines.rsi, end)[start:end] = out[start:end]
+
+
+class FastBB(_OnePassMixin, bt.Indicator):
+    """Bollinger Bands; same ``mid``/``top``/``bot`` lines as ``bt.indicators.BollingerBands``."""
+    alias = ("FastBollingerBands",)
+    lines = ("mid", "top", "bot")
+    params = (("period", 20), ("devfactor", 2.0))
+    plotinfo = dict(subplot=False)
+    plotlines = dict(
+        mid=dict(ls="--"),
+        top=dict(_samecolor=True),
+        bot=dict(_samecolor=True),
+    )
+
+    def __init__(self):
+        self.addminperiod(self.p.period)
+
+    def next(self):
+        window = self.data.get(size=self.p.period)
+        mid = math.fsum(window) / self.p.period
+        meansq = math.fsum(v * v for v in window) / self.p.period
+        dev = self.p.devfactor * abs(meansq - mid * mid) ** 0.5
+        self.lines.mid[0] = mid
+        self.lines.top[0] = mid + dev
+        self.lines.bot[0] = mid - dev
+
+    def _fill(self, start, end):
+        mid, top, bot = _cached(bollinger, _as_array(self.data, end),
+                                self.p.period, float(self.p.devfactor))
+        _as_array(self.lines.mid, end)[start:end] = mid[start:end]
+        _as_array(self.lines.top, end)[start:end] = top[start:end]
+        _as_array(self.lines.bot, end)[start:end] = bot[start:end]
+
+
+class FastIndicators(_OnePassMixin, _WilderRSIMixin, bt.Indicator):
+    """
+    The inputs of the oversold-bounce strategies in one indicator: ``rsi``
+    (``FastRSI``), ``trend`` (``FastSMA``) and ``bb_bot`` (``FastBB.bot``).
+
+    ``oncestart()`` fills all three in a single pass over the data
+    (``kernels.oversold_indicators``) instead of one pass each.  All lines
+    start at the longest of the three warm-ups.  Only ``rsi`` is plotted:
+    the other two are on the price scale.
+    """
+    lines = ("rsi", "trend", "bb_bot")
+    params = (
+        ("rsi_period", 14),
+        ("trend_period", 50),
+        ("bb_period", 20),
+        ("devfactor", 2.0),
+        ("safehigh", 100.0),
+        ("safelow", 50.0),
+    )
+    plotlines = dict(trend=dict(_plotskip=True), bb_bot=dict(_plotskip=True))
+
+    def __init__(self):
+        self.addminperiod(max(self.p.rsi_period + 1, self.p.trend_period,
+                              self.p.bb_period))
+        self._rsi_init(self.p.rsi_period, self.p.safehigh, self.p.safelow)
+
+    def prenext(self):
+        # Keep the RSI averages current through the longer warm-ups
+        if len(self) > self.p.rsi_period:
+            self._rsi_next()
+
+    def next(self):
+        self.lines.rsi[0] = self._rsi_next()
+        trend = self.p.trend_period
+        self.lines.trend[0] = math.fsum(self.data.get(size=trend)) / trend
+        window = self.data.get(size=self.p.bb_period)
+        mid = math.fsum(window) / self.p.bb_period
+        meansq = math.fsum(v * v for v in window) / self.p.bb_period
+        self.lines.bb_bot[0] = mid - self.p.devfactor * abs(meansq - mid * mid) ** 0.5
+
+    def _fill(self, start, end):
+        rsi, trend, bb_bot = _cached(
+            oversold_indicators, _as_array(self.data, end), self.p.rsi_period,
+            self.p.trend_period, self.p.bb_period, float(self.p.devfactor),
+            float(self.p.safehigh), float(self.p.safelow))
+        _as_array(self.lines.rsi, end)[start:end] = rsi[start:end]
+        _as_array(self.lines.trend, end)[start:end] = trend[start:end]
+        _as_array(self.lines.bb_bot, end)[start:end] = bb_bot[start:end]
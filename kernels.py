@@ -0,0 +1,561 @@
+"""
+Numba-compiled array kernels shared by the strategies and the vectorized
+runner.
+
+Numba is optional: without it ``njit`` below is a no-op decorator and the
+kernels run as plain Python (same results, just slower).  ``cache=True``
+persists compiled code next to this file so later runs skip the JIT.
+
+``python build_aot.py`` compiles the public kernels ahead of time into a
+``kernels_aot`` extension module; when that is importable it replaces the
+JIT versions, so even a fresh checkout or cache pays no compile time.
+
+Every kernel declares its signature (``_kernel``) for the AOT build.  The
+JIT versions stay lazy: eager compilation would compile every kernel at
+import (seconds on a cold cache, even for ones the AOT build replaces)
+and reject the read-only arrays ``collector`` hands out.  fastmath stays
+off: reassociation/contraction would break the exact summation and
+bit-for-bit agreement with backtrader, and nnan/ninf would break the
+NaN-disabled TP/SL levels.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Fallback when numba is missing: return the function unchanged."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(fn):
+            return fn
+        return decorator
+
+
+# Declared signature of every kernel, by name (read by build_aot.py)
+SIGNATURES = {}
+
+
+def _kernel(signature, **options):
+    """``njit`` for a kernel, recording its AOT *signature*."""
+    def decorator(fn):
+        SIGNATURES[fn.__name__] = signature
+        return njit(cache=True, boundscheck=False, **options)(fn)
+    return decorator
+
+
+# Columns of the packed price matrix the trade-walk kernels take
+OPEN, HIGH, LOW, CLOSE = 0, 1, 2, 3
+
+
+def pack_ohlc(open_, high, low, close):
+    """
+    One C-contiguous ``(N, 4)`` float64 matrix of the price arrays, columns
+    ``OPEN``/``HIGH``/``LOW``/``CLOSE``.  The trade walks read several
+    prices of the same bar together; packed, they share a cache line
+    instead of coming from four separate arrays.
+    """
+    return np.ascontiguousarray(np.column_stack((open_, high, low, close)),
+                                dtype=np.float64)
+
+
+@_kernel("i8(f8[:, ::1], i8, i8, f8, f8, f8)")
+def first_tp_sl_exit(ohlc, start, stop, entry, tp, sl):
+    """
+    Index of the first bar of *ohlc* (``pack_ohlc``) in ``[start, stop]``
+    whose low breaches the stop-loss or whose high reaches the take-profit,
+    else -1.
+
+    *tp* / *sl* are fractions of *entry*; pass NaN to disable either one
+    (every comparison against NaN is false).
+    """
+    sl_price = entry * (1 - sl)
+    tp_price = entry * (1 + tp)
+    for i in range(start, stop + 1):
+        if ohlc[i, LOW] <= sl_price or ohlc[i, HIGH] >= tp_price:
+            return i
+    return -1
+
+
+# Called from other kernels under this name, which the AOT import at the
+# bottom leaves alone: compiled kernels can only call JIT functions.
+_first_tp_sl_exit = first_tp_sl_exit
+
+
+# Enough for any exact sum of finite doubles: Shewchuk partials never
+# overlap, and the double exponent range spans ~2100 bits, i.e. at most ~40
+# partials.  NaN/inf never cancel out of an expansion, so the sliding sums
+# keep them out of it (_split_nonfinite).
+_MAX_PARTIALS = 64
+
+
+@_kernel("i8(f8[:], i8, f8)")
+def _add_partial(partials, n, v):
+    """
+    Add *v* exactly to the sum held in ``partials[:n]`` (Shewchuk's
+    non-overlapping expansion, as in ``math.fsum``); returns the new count.
+    """
+    i = 0
+    for j in range(n):
+        y = partials[j]
+        if abs(v) < abs(y):
+            v, y = y, v
+        s = v + y
+        err = y - (s - v)
+        if err != 0.0:
+            partials[i] = err
+            i += 1
+        v = s
+    if v != 0.0:
+        if i == len(partials):
+            # Only reachable once NaN/inf is in the expansion (finite sums
+            # need ~40 slots): keep it NaN and bounded instead of writing
+            # past the buffer
+            partials[0] = np.nan
+            return 1
+        partials[i] = v
+        i += 1
+    return i
+
+
+@_kernel("f8(f8[:], i8)")
+def _round_partials(partials, n):
+    """The exact sum in ``partials[:n]``, correctly rounded like ``math.fsum``."""
+    if n == 0:
+        return 0.0
+    n -= 1
+    s = partials[n]
+    err = 0.0
+    while n > 0:
+        v = s
+        n -= 1
+        y = partials[n]
+        s = v + y
+        err = y - (s - v)
+        if err != 0.0:
+            break
+    # Round half-way cases the same way CPython does
+    if n > 0 and ((err < 0.0 and partials[n - 1] < 0.0) or
+                  (err > 0.0 and partials[n - 1] > 0.0)):
+        y = err * 2.0
+        v = s + y
+        if y == v - s:
+            s = v
+    return s
+
+
+@_kernel("Tuple((f8[:], i8[:]))(f8[:])")
+def _split_nonfinite(x):
+    """
+    ``(finite, seen)``: *x* with NaN/inf replaced by 0.0, and the number
+    of NaN/inf values in ``x[:i + 1]`` at each index ``i``.  A window
+    ``x[lo:hi]`` holds ``seen[hi - 1] - seen[lo - 1]`` of them.
+    """
+    n = len(x)
+    finite = np.empty(n)
+    seen = np.empty(n, dtype=np.int64)
+    count = 0
+    for i in range(n):
+        v = x[i]
+        if abs(v) < np.inf:
+            finite[i] = v
+        else:
+            finite[i] = 0.0
+            count += 1
+        seen[i] = count
+    return finite, seen
+
+
+@_kernel("b1(i8[:], i8, i8)")
+def _window_finite(seen, i, period):
+    """Whether the *period* bars ending at *i* hold no NaN/inf (see above)."""
+    return seen[i] == (seen[i - period] if i >= period else 0)
+
+
+@_kernel("f8(f8[:], i8, i8)")
+def _fsum(x, lo, hi):
+    """``math.fsum(x[lo:hi])`` for finite input, else NaN."""
+    partials = np.empty(_MAX_PARTIALS)
+    n = 0
+    for k in range(lo, hi):
+        if not abs(x[k]) < np.inf:
+            return np.nan
+        n = _add_partial(partials, n, x[k])
+    return _round_partials(partials, n)
+
+
+@_kernel("f8[:](f8[:], i8)")
+def rolling_mean(x, period):
+    """
+    Simple moving average of *x* (``bt.indicators.SMA``), NaN during warm-up.
+
+    The window sum slides in O(1) per bar by adding the new value and
+    subtracting the dropped one *exactly*, so each mean is still the
+    correctly rounded ``math.fsum(window) / period`` backtrader computes,
+    with no drift however long the series.  Windows holding NaN or inf
+    are NaN.
+    """
+    n = len(x)
+    out = np.full(n, np.nan)
+    finite, seen = _split_nonfinite(x)
+    partials = np.empty(_MAX_PARTIALS)
+    k = 0
+    for i in range(n):
+        k = _add_partial(partials, k, finite[i])
+        if i >= period:
+            k = _add_partial(partials, k, -finite[i - period])
+        if i >= period - 1 and _window_finite(seen, i, period):
+            out[i] = _round_partials(partials, k) / period
+    return out
+
+
+_rolling_mean = rolling_mean
+
+
+@_kernel("f8[:, :](f8[:], i8[:])", parallel=True)
+def rolling_means(x, periods):
+    """
+    ``rolling_mean`` for several periods at once, one row per period
+    (rows keep each average contiguous); periods run on parallel threads.
+    """
+    out = np.empty((len(periods), len(x)))
+    for j in prange(len(periods)):
+        out[j] = _rolling_mean(x, periods[j])
+    return out
+
+
+@_kernel("f8[:](f8[:], i8, f8, f8)")
+def wilder_rsi(x, period, safehigh, safelow):
+    """
+    Wilder RSI (``bt.indicators.RSI``): up/down moves smoothed with an SMMA
+    seeded by the simple mean of the first *period* moves.
+
+    A zero average loss yields *safehigh* (or *safelow* when the average
+    gain is zero too), like backtrader's ``safediv`` option.
+    """
+    n = len(x)
+    out = np.full(n, np.nan)
+    if n <= period:
+        return out
+    up = np.zeros(n)
+    down = np.zeros(n)
+    for i in range(1, n):
+        up[i] = max(x[i] - x[i - 1], 0.0)
+        down[i] = max(x[i - 1] - x[i], 0.0)
+
+    alpha = 1.0 / period
+    alpha1 = 1.0 - alpha
+    maup = _fsum(up, 1, period + 1) / period
+    madown = _fsum(down, 1, period + 1) / period
+    for i in range(period, n):
+        if i > period:
+            maup = maup * alpha1 + up[i] * alpha
+            madown = madown * alpha1 + down[i] * alpha
+        if madown != 0.0:
+            out[i] = 100.0 - 100.0 / (1.0 + maup / madown)
+        elif maup != 0.0:
+            out[i] = safehigh
+        else:
+            out[i] = safelow
+    return out
+
+
+@_kernel("UniTuple(f8[:], 3)(f8[:], i8, f8)")
+def bollinger(x, period, devfactor):
+    """
+    Bollinger Bands (``bt.indicators.BollingerBands``) as ``(mid, top, bot)``:
+    SMA plus/minus *devfactor* population standard deviations.
+
+    Both window means slide in O(1) per bar like ``rolling_mean``.
+    Squares are plain products; backtrader goes through ``pow(x, 2)``,
+    which libm occasionally rounds differently, so bands can differ from
+    backtrader's in the last few bits.
+    """
+    n = len(x)
+    mid = np.full(n, np.nan)
+    top = np.full(n, np.nan)
+    bot = np.full(n, np.nan)
+    means = _rolling_mean(x, period)
+    meansqs = _rolling_mean(x * x, period)
+    for i in range(period - 1, n):
+        m = means[i]
+        dev = devfactor * abs(meansqs[i] - m * m) ** 0.5
+        mid[i] = m
+        top[i] = m + dev
+        bot[i] = m - dev
+    return mid, top, bot
+
+
+@_kernel("UniTuple(f8[:], 3)(f8[:], i8, i8, i8, f8, f8, f8)")
+def oversold_indicators(x, rsi_period, trend_period, bb_period, devfactor,
+                        safehigh, safelow):
+    """
+    ``(rsi, trend, bb_bot)`` for the oversold-bounce strategies in a single
+    pass over *x*: ``wilder_rsi(x, rsi_period, safehigh, safelow)``,
+    ``rolling_mean(x, trend_period)`` and the ``bot`` band of
+    ``bollinger(x, bb_period, devfactor)``, with the same values bit for bit.
+    """
+    n = len(x)
+    finite, seen = _split_nonfinite(x)
+    squares, sq_seen = _split_nonfinite(x * x)
+    rsi = np.full(n, np.nan)
+    trend = np.full(n, np.nan)
+    bot = np.full(n, np.nan)
+    trend_sum = np.empty(_MAX_PARTIALS)
+    bb_sum = np.empty(_MAX_PARTIALS)
+    bb_sumsq = np.empty(_MAX_PARTIALS)
+    up_sum = np.empty(_MAX_PARTIALS)
+    down_sum = np.empty(_MAX_PARTIALS)
+    kt = kb = ks = ku = kd = 0
+    up_finite = down_finite = True
+    alpha = 1.0 / rsi_period
+    alpha1 = 1.0 - alpha
+    maup = madown = 0.0
+    for i in range(n):
+        kt = _add_partial(trend_sum, kt, finite[i])
+        if i >= trend_period:
+            kt = _add_partial(trend_sum, kt, -finite[i - trend_period])
+        if i >= trend_period - 1 and _window_finite(seen, i, trend_period):
+            trend[i] = _round_partials(trend_sum, kt) / trend_period
+
+        kb = _add_partial(bb_sum, kb, finite[i])
+        ks = _add_partial(bb_sumsq, ks, squares[i])
+        if i >= bb_period:
+            kb = _add_partial(bb_sum, kb, -finite[i - bb_period])
+            ks = _add_partial(bb_sumsq, ks, -squares[i - bb_period])
+        if (i >= bb_period - 1 and _window_finite(seen, i, bb_period)
+                and _window_finite(sq_seen, i, bb_period)):
+            m = _round_partials(bb_sum, kb) / bb_period
+            meansq = _round_partials(bb_sumsq, ks) / bb_period
+            bot[i] = m - devfactor * abs(meansq - m * m) ** 0.5
+
+        if i == 0:
+            continue
+        up = max(x[i] - x[i - 1], 0.0)
+        down = max(x[i - 1] - x[i], 0.0)
+        if i <= rsi_period:
+            # Seed: simple mean of the first rsi_period moves (NaN if any
+            # is NaN/inf, as in wilder_rsi)
+            if abs(up) < np.inf:
+                ku = _add_partial(up_sum, ku, up)
+            else:
+                up_finite = False
+            if abs(down) < np.inf:
+                kd = _add_partial(down_sum, kd, down)
+            else:
+                down_finite = False
+            if i < rsi_period:
+                continue
+            maup = (_round_partials(up_sum, ku) / rsi_period
+                    if up_finite else np.nan)
+            madown = (_round_partials(down_sum, kd) / rsi_period
+                      if down_finite else np.nan)
+        else:
+            maup = maup * alpha1 + up * alpha
+            madown = madown * alpha1 + down * alpha
+        if madown != 0.0:
+            rsi[i] = 100.0 - 100.0 / (1.0 + maup / madown)
+        elif maup != 0.0:
+            rsi[i] = safehigh
+        else:
+            rsi[i] = safelow
+    return rsi, trend, bot
+
+
+@_kernel("Tuple((i8[:], i8[:], f8[:], f8[:]))"
+         "(f8[:, ::1], i8[:], i8[:], f8, f8, f8)")
+def replay_crossovers(ohlc, cross_up, cross_dn, tp, sl, slippage):
+    """
+    Long-only crossover trade walk (``MAStrategy.replay_crossovers``) over
+    the ``pack_ohlc`` matrix *ohlc*.
+
+    Enter on the bar after each bullish crossover in *cross_up* we are flat
+    for, at its open plus *slippage* (capped at its high); exit after the
+    first TP/SL breach or the next bearish crossover in *cross_dn*, at the
+    following open minus *slippage* (floored at its low).  *tp* / *sl* are
+    fractions of the entry price, NaN to disable.
+
+    Returns ``(entries, exits, entry_px, exit_px)``: signal bar indices and
+    fill prices, with ``exits == -1`` / NaN for a trade open at the end.
+    """
+    n = ohlc.shape[0]
+    m = len(cross_up)
+    entries = np.empty(m, dtype=np.int64)
+    exits = np.empty(m, dtype=np.int64)
+    entry_px = np.empty(m)
+    exit_px = np.empty(m)
+
+    t = 0
+    i = -1
+    while True:
+        # Next bullish crossover we are flat for (needs a bar to fill on)
+        k = np.searchsorted(cross_up, i + 1)
+        if k == m or cross_up[k] >= n - 1:
+            break
+        sig = cross_up[k]
+        fill = sig + 1
+        entry = min(ohlc[fill, OPEN] * (1 + slippage), ohlc[fill, HIGH])
+
+        # Exit on the first TP/SL breach before the next bearish cross
+        j = np.searchsorted(cross_dn, fill)
+        stop = cross_dn[j] if j < len(cross_dn) else n - 1
+        out = _first_tp_sl_exit(ohlc, fill, stop, entry, tp, sl)
+        if out < 0 and j < len(cross_dn):
+            out = stop
+
+        entries[t] = sig
+        entry_px[t] = entry
+        t += 1
+        if out == -1 or out >= n - 1:
+            exits[t - 1] = -1
+            exit_px[t - 1] = np.nan
+            break
+        exits[t - 1] = out
+        exit_px[t - 1] = max(ohlc[out + 1, OPEN] * (1 - slippage),
+                             ohlc[out + 1, LOW])
+        i = out  # flat again from the exit fill bar (out + 1)
+
+    return entries[:t], exits[:t], entry_px[:t], exit_px[:t]
+
+
+_replay_crossovers = replay_crossovers
+
+
+@_kernel("Tuple((f8[:], i8[:], i8[:], i8[:]))"
+         "(f8[:, ::1], i8[:], i8[:], i8[:], i8[:],"
+         " i8[:], f8[:], f8[:], f8, f8, f8, f8)", parallel=True)
+def simulate_all(ohlc, up_idx, up_off, dn_idx, dn_off, combo_pair, combo_tp,
+                 combo_sl, slippage, cash, exposure, rate):
+    """
+    Replay and account every combination of a crossover sweep in parallel.
+
+    Crossover indices for MA pair ``p`` are ``up_idx[up_off[p]:up_off[p + 1]]``
+    (and likewise *dn_idx*); combination ``c`` replays pair
+    ``combo_pair[c]`` with TP/SL ``combo_tp[c]`` / ``combo_sl[c]`` (NaN
+    disables).  Sizing is *exposure* times cash at the signal close, and
+    commission is ``abs(size) * price * rate`` per fill, as in the
+    vectorized runner; a trade open at the end is marked to market.
+
+    Returns ``(end_value, trades, won, lost)``, one entry per combination.
+    """
+    n_combos = len(combo_pair)
+    end_value = np.empty(n_combos)
+    trades = np.empty(n_combos, dtype=np.int64)
+    won = np.zeros(n_combos, dtype=np.int64)
+    lost = np.zeros(n_combos, dtype=np.int64)
+    for c in prange(n_combos):
+        p = combo_pair[c]
+        entries, exits, entry_px, exit_px = _replay_crossovers(
+            ohlc, up_idx[up_off[p]:up_off[p + 1]],
+            dn_idx[dn_off[p]:dn_off[p + 1]], combo_tp[c], combo_sl[c], slippage)
+
+        value = cash
+        for t in range(len(entries)):
+            ep = entry_px[t]
+            size = value * exposure / ohlc[entries[t], CLOSE]
+            entry_comm = abs(size) * ep * rate
+            if exits[t] < 0:
+                value = value - entry_comm + size * (ohlc[-1, CLOSE] - ep)
+                break
+            xp = exit_px[t]
+            pnlcomm = size * (xp - ep) - entry_comm - abs(size) * xp * rate
+            value += pnlcomm
+            if pnlcomm >= 0:
+                won[c] += 1
+            else:
+                lost[c] += 1
+        end_value[c] = value
+        trades[c] = len(entries)
+    return end_value, trades, won, lost
+
+
+# Exit reasons from first_exit, in priority order
+EXIT_NONE, EXIT_SL, EXIT_TP, EXIT_RSI = 0, 1, 2, 3
+
+
+@_kernel("UniTuple(i8, 2)(f8[:, ::1], f8[:], i8, i8, f8, f8, f8, f8)")
+def first_exit(ohlc, rsi, start, stop, entry, tp, sl, rsi_exit):
+    """
+    ``(index, reason)`` of the first bar in ``[start, stop]`` that hits the
+    stop-loss, the take-profit or an RSI above *rsi_exit*, else
+    ``(-1, EXIT_NONE)``.  When several hit on one bar the reason follows
+    ``OversoldBounceStrategy.next``: SL, then TP, then RSI.
+
+    The three tests are combined arithmetically rather than as an if/elif
+    chain, leaving one data-dependent branch per bar.  NaN disables a level.
+    """
+    sl_price = entry * (1 - sl)
+    tp_price = entry * (1 + tp)
+    for i in range(start, stop + 1):
+        hit_sl = ohlc[i, LOW] <= sl_price
+        hit_tp = ohlc[i, HIGH] >= tp_price
+        hit_rsi = rsi[i] > rsi_exit
+        reason = (hit_sl * EXIT_SL
+                  + (1 - hit_sl) * (hit_tp * EXIT_TP
+                                    + (1 - hit_tp) * hit_rsi * EXIT_RSI))
+        if reason:
+            return i, reason
+    return -1, EXIT_NONE
+
+
+_first_exit = first_exit
+
+
+@_kernel("Tuple((i8[:], i8[:], f8[:], f8[:]))"
+         "(f8[:, ::1], f8[:], i8[:], f8, f8, f8, f8)")
+def replay_entries(ohlc, rsi, entry_idx, tp, sl, rsi_exit, slippage):
+    """
+    Long-only trade walk for ``OversoldBounceStrategy.vectorized_signals``.
+
+    Enter on the bar after each signal bar in *entry_idx* we are flat for,
+    exit on the bar after ``first_exit`` fires; fills as in
+    ``replay_crossovers``, and so is the return value.
+    """
+    n = ohlc.shape[0]
+    m = len(entry_idx)
+    entries = np.empty(m, dtype=np.int64)
+    exits = np.empty(m, dtype=np.int64)
+    entry_px = np.empty(m)
+    exit_px = np.empty(m)
+
+    t = 0
+    i = -1
+    while True:
+        k = np.searchsorted(entry_idx, i + 1)
+        if k == m or entry_idx[k] >= n - 1:
+            break
+        sig = entry_idx[k]
+        fill = sig + 1
+        entry = min(ohlc[fill, OPEN] * (1 + slippage), ohlc[fill, HIGH])
+        out, _ = _first_exit(ohlc, rsi, fill, n - 1, entry, tp, sl, rsi_exit)
+
+        entries[t] = sig
+        entry_px[t] = entry
+        t += 1
+        if out == -1 or out >= n - 1:
+            exits[t - 1] = -1
+            exit_px[t - 1] = np.nan
+            break
+        exits[t - 1] = out
+        exit_px[t - 1] = max(ohlc[out + 1, OPEN] * (1 - slippage),
+                             ohlc[out + 1, LOW])
+        i = out
+
+    return entries[:t], exits[:t], entry_px[:t], exit_px[:t]
+
+
+# JIT versions, kept for build_aot.py, which compiles these same functions
+JIT_KERNELS = (first_tp_sl_exit, rolling_mean, wilder_rsi, bollinger,
+               oversold_indicators, replay_crossovers, first_exit,
+               replay_entries)
+
+try:
+    from kernels_aot import (bollinger, first_exit, first_tp_sl_exit,
+                             oversold_indicators, replay_crossovers,
+                             replay_entries, rolling_mean, wilder_rsi)
+except ImportError:
+    pass
@@ -5,13 +5,103 @@ Import any strategy from here, or point backtest.py at your own module.
 Each class must subclass ``bt.Strategy``.
 """
 
+import math
+
 import backtrader as bt
+import numpy as np
+
+from indicators import FastIndicators, FastSMA
+from kernels import (oversold_indicators, pack_ohlc, replay_entries,
+                     rolling_mean)
+from kernels import replay_crossovers as _replay_crossovers
+
+
+def _exit_levels(entry, tp, sl):
+    """
+    ``(tp_price, sl_price)`` for a long filled at *entry*; *tp* / *sl* are
+    fractions of it.  ``None`` disables a level (±inf never triggers).
+
+    Computed once per fill, so ``next()`` only does two comparisons:
+    ``high >= tp_price`` or ``low <= sl_price``.
+    """
+    tp_price = entry * (1 + tp) if tp is not None else math.inf
+    sl_price = entry * (1 - sl) if sl is not None else -math.inf
+    return tp_price, sl_price
+
+
+def _cross(d0, d1, up=True):
+    """
+    Vectorised ``bt.indicators.CrossOver`` half: *d0* crossing *d1* upwards
+    (or downwards) using the last non-zero difference, like backtrader.
+    """
+    diff = d0 - d1
+    valid = np.flatnonzero(~np.isnan(diff))
+    cross = np.zeros(len(diff), dtype=bool)
+    if len(valid) < 2:
+        return cross
+    first = valid[0]
+    d = diff[first:]
+    # Forward-fill the last non-zero difference (seeded with the first value)
+    keep = d != 0
+    keep[0] = True
+    nzd = d[np.maximum.accumulate(np.where(keep, np.arange(len(d)), 0))]
+    if up:
+        cross[first + 1:] = (nzd[:-1] < 0) & (d[1:] > 0)
+    else:
+        cross[first + 1:] = (nzd[:-1] > 0) & (d[1:] < 0)
+    return cross
+
+
+def _full_arrays(*lines):
+    """
+    Backing arrays of *lines* for direct ``array[idx]`` reads.  Those need
+    every bar kept (``exactbars=0``); a bounded buffer would silently
+    return the wrong bars, so it is rejected instead.
+    """
+    if any(line.mode == bt.LineBuffer.QBuffer for line in lines):
+        raise RuntimeError("strategy needs full line buffers: run cerebro "
+                           "with exactbars=0 (see _required_cerebro_opts)")
+    return tuple(line.array for line in lines)
+
+
+# Statuses after which an order is no longer pending
+_DONE_STATUSES = frozenset((bt.Order.Completed, bt.Order.Canceled,
+                            bt.Order.Margin, bt.Order.Rejected))
+
+
+class _EntryPriceMixin:
+    """
+    Shared ``notify_order``: records the actual fill price of the entry in
+    ``self.entry_price`` (None while flat), with its TP/SL prices in
+    ``self._tp_price`` / ``self._sl_price`` from the strategy's ``_tp`` /
+    ``_sl``, and clears ``self.order`` once the pending order is done.
+
+    ``self._in_position`` mirrors "holding a long" for next(): it flips only
+    on completed fills, which backtrader notifies before the next bar's
+    next(), so it answers what ``self.position`` would without going
+    through the broker's Position object every bar.
+    """
+    _in_position = False
+
+    def notify_order(self, order):
+        status = order.status
+        if status == bt.Order.Completed:
+            if order.isbuy():
+                self._in_position = True
+                self.entry_price = order.executed.price
+                self._tp_price, self._sl_price = _exit_levels(
+                    self.entry_price, self._tp, self._sl)
+            else:
+                self._in_position = False
+                self.entry_price = None
+        if status in _DONE_STATUSES:
+            self.order = None
 
 
 # ---------------------------------------------------------------------------
 # Simple MA cross-over
 # ---------------------------------------------------------------------------
-class MAStrategy(bt.Strategy):
+class MAStrategy(_EntryPriceMixin, bt.Strategy):
     """
     Buy on fast-MA crossing above slow-MA, sell on the reverse.
 
@@ -20,7 +110,13 @@ class MAStrategy(bt.Strategy):
 
     target_data_index: when 1 (MTF mode), use datas[1] for signals instead
     of datas[0]. The runner sets this automatically when --granular-tf is used.
+
+    Run mode: the indicators are filled in one pass with runonce/preload,
+    and next() reads the line arrays directly, which needs exactbars=0.
     """
+    # Read by backtest.py when building Cerebro
+    _required_cerebro_opts = dict(runonce=True, preload=True, exactbars=0)
+
     params = (
         ("fast", 10),
         ("slow", 30),
@@ -31,54 +127,105 @@ class MAStrategy(bt.Strategy):
 
     def __init__(self):
         data = self.datas[self.params.target_data_index]
-        self.fast_ma = bt.indicators.SMA(data.close, period=self.params.fast)
-        self.slow_ma = bt.indicators.SMA(data.close, period=self.params.slow)
+        self.fast_ma = FastSMA(data.close, period=self.params.fast)
+        self.slow_ma = FastSMA(data.close, period=self.params.slow)
         self.crossover = bt.indicators.CrossOver(self.fast_ma, self.slow_ma)
         self.order = None
         self.entry_price = None
+        self._data = data  # target_data_index is fixed for the run
+        self._tp = self.p.takeprofit_pct
+        self._sl = self.p.stoploss_pct
+        # Pick the per-bar path once: by default neither TP nor SL is set
+        if self._tp is None and self._sl is None:
+            self.next = self._next_crossover
+        else:
+            self.next = self._next_tp_sl
 
-    @property
-    def _data(self):
-        return self.datas[self.params.target_data_index]
+    def nextstart(self):
+        # Buffers are final once next() starts: read them directly at the
+        # feed's current index instead of through LineBuffer.__getitem__
+        self._pos = self._data.lines.close
+        self._crossovers, self._highs, self._lows = _full_arrays(
+            self.crossover.lines.crossover, self._data.lines.high,
+            self._data.lines.low)
+        self.next()
 
-    def notify_order(self, order):
-        if order.status == order.Completed:
-            if order.isbuy():
-                self.entry_price = order.executed.price
-            else:
-                self.entry_price = None
-        if order.status in [order.Completed, order.Canceled, order.Margin, order.Rejected]:
-            self.order = None
+    def _next_crossover(self):
+        if self.order:
+            return
+        i = self._pos.idx
+        if not self._in_position:
+            if self._crossovers[i] > 0:
+                self.order = self.buy(data=self._data)
+        elif self._crossovers[i] < 0:
+            self.order = self.close(data=self._data)
 
-    def next(self):
+    def _next_tp_sl(self):
         if self.order:
             return
-        data = self._data
-        if not self.position:
-            if self.crossover > 0:
-                self.order = self.buy(data=data)
+        i = self._pos.idx
+        if not self._in_position:
+            if self._crossovers[i] > 0:
+                self.order = self.buy(data=self._data)
         else:
-            # TP/SL check (when set), before crossover signal
-            if self.entry_price is not None:
-                tp = self.params.takeprofit_pct
-                sl = self.params.stoploss_pct
-                if tp is not None or sl is not None:
-                    high = data.high[0]
-                    low = data.low[0]
-                    if sl is not None and low <= self.entry_price * (1 - sl):
-                        self.order = self.close(data=data)
-                        return
-                    if tp is not None and high >= self.entry_price * (1 + tp):
-                        self.order = self.close(data=data)
-                        return
-            if self.crossover < 0:
-                self.order = self.close(data=data)
+            # TP/SL check before crossover signal
+            if self._lows[i] <= self._sl_price or self._highs[i] >= self._tp_price:
+                self.order = self.close(data=self._data)
+                return
+            if self._crossovers[i] < 0:
+                self.order = self.close(data=self._data)
+
+    @classmethod
+    def vectorized_signals(cls, open_, high, low, close, fast=10, slow=30,
+                           takeprofit_pct=None, stoploss_pct=None, slippage=0.0):
+        """
+        Replay the strategy over whole OHLC arrays with NumPy instead of
+        backtrader's per-bar ``next()``.
+
+        Mirrors the event-driven version: signals on a bar's close fill at
+        the next bar's open (with *slippage*, capped at the bar's high/low),
+        and TP/SL are checked against each bar's high/low from the entry
+        bar on.  Work is per trade, not per bar: each trade only scans up
+        to the next bearish crossover.
+
+        Returns ``(entries, exits, entry_px, exit_px)`` as arrays of signal
+        bar indices and fill prices; a trade still open at the end has
+        ``exits == -1`` and ``exit_px`` NaN.
+        """
+        cross_up, cross_dn = cls.crossovers(rolling_mean(close, fast),
+                                            rolling_mean(close, slow))
+        return cls.replay_crossovers(pack_ohlc(open_, high, low, close),
+                                     cross_up, cross_dn, takeprofit_pct,
+                                     stoploss_pct, slippage)
+
+    @staticmethod
+    def crossovers(fast_ma, slow_ma):
+        """Bar indices where *fast_ma* crosses above / below *slow_ma*."""
+        return (np.flatnonzero(_cross(fast_ma, slow_ma, up=True)),
+                np.flatnonzero(_cross(fast_ma, slow_ma, up=False)))
+
+    @staticmethod
+    def replay_crossovers(ohlc, cross_up, cross_dn,
+                          takeprofit_pct=None, stoploss_pct=None, slippage=0.0):
+        """
+        Trade walk behind ``vectorized_signals``, starting from the packed
+        price matrix (``kernels.pack_ohlc``) and crossover indices (see
+        ``crossovers``) so sweeps can reuse both across TP/SL values.  Same
+        return value as ``vectorized_signals``.
+        """
+        # NaN disables a level inside the kernel
+        return _replay_crossovers(
+            ohlc, cross_up, cross_dn,
+            np.nan if takeprofit_pct is None else float(takeprofit_pct),
+            np.nan if stoploss_pct is None else float(stoploss_pct),
+            float(slippage),
+        )
 
 
 # ---------------------------------------------------------------------------
 # Oversold-bounce mean-reversion (single timeframe)
 # ---------------------------------------------------------------------------
-class OversoldBounceStrategy(bt.Strategy):
+class OversoldBounceStrategy(_EntryPriceMixin, bt.Strategy):
     """
     Buy extreme oversold dips (RSI + Bollinger lower-band) in an uptrend,
     then take a quick profit or cut losses fast.
@@ -89,7 +236,12 @@ class OversoldBounceStrategy(bt.Strategy):
 
     target_data_index: when 1 (MTF mode), use datas[1] for signals instead
     of datas[0]. The runner sets this automatically when --granular-tf is used.
+
+    Run mode: as for MAStrategy, runonce/preload with exactbars=0.
     """
+    # Read by backtest.py when building Cerebro
+    _required_cerebro_opts = dict(runonce=True, preload=True, exactbars=0)
+
     params = (
         ("rsi_period", 14),
         ("rsi_oversold", 28),
@@ -102,54 +254,74 @@ class OversoldBounceStrategy(bt.Strategy):
 
     def __init__(self):
         data = self.datas[self.params.target_data_index]
-        self.rsi = bt.indicators.RSI(data.close, period=self.params.rsi_period)
-        self.bb = bt.indicators.BollingerBands(data.close, period=20, devfactor=2)
-        self.trend_sma = bt.indicators.SMA(data.close, period=self.params.trend_ma)
+        self.ind = FastIndicators(data.close, rsi_period=self.params.rsi_period,
+                                  trend_period=self.params.trend_ma,
+                                  bb_period=20, devfactor=2)
         self.order = None
         self.entry_price = None
 
-    @property
-    def _data(self):
-        return self.datas[self.params.target_data_index]
+        # Resolve line objects and params once; next() runs every bar
+        self._data = data
+        self._close = data.lines.close
+        self._high = data.lines.high
+        self._low = data.lines.low
+        self._rsi_line = self.ind.lines.rsi
+        self._bb_bot = self.ind.lines.bb_bot
+        self._trend = self.ind.lines.trend
+        self._tp = self.p.takeprofit_pct
+        self._sl = self.p.stoploss_pct
+        self._rsi_os = self.p.rsi_oversold
+        self._rsi_exit = self.p.rsi_exit
 
-    def notify_order(self, order):
-        if order.status == order.Completed:
-            if order.isbuy():
-                self.entry_price = order.executed.price
-            else:  # sell / close
-                self.entry_price = None
-        if order.status in [order.Completed, order.Canceled, order.Margin, order.Rejected]:
-            self.order = None
+        # Entry gate as one line: with runonce it is evaluated over the whole
+        # preloaded series in a single pass, so next() only reads a value
+        self._entry_signal = bt.And(
+            self._close > self._trend,
+            self._rsi_line < self._rsi_os,
+            self._close <= self._bb_bot,
+        )
+
+    def nextstart(self):
+        # Buffers are final once next() starts: read them directly at the
+        # feed's current index instead of through LineBuffer.__getitem__
+        self._signals, self._highs, self._lows, self._rsis = _full_arrays(
+            self._entry_signal.lines[0], self._high, self._low, self._rsi_line)
+        self.next()
 
     def next(self):
         if self.order:
             return
 
-        data = self._data
-        if not self.position:
-            price = data.close[0]
-            in_uptrend = price > self.trend_sma[0]
-            oversold = self.rsi[0] < self.params.rsi_oversold
-            below_lower_bb = price <= self.bb.lines.bot[0]
-            if in_uptrend and oversold and below_lower_bb:
-                self.order = self.buy(data=data)
+        i = self._close.idx
+        if not self._in_position:
+            if self._signals[i]:
+                self.order = self.buy(data=self._data)
         else:
-            if self.entry_price is None:
-                return  # fill notification hasn't arrived yet
+            if self._lows[i] <= self._sl_price or self._highs[i] >= self._tp_price:
+                self.order = self.close(data=self._data)
+            elif self._rsis[i] > self._rsi_exit:
+                self.order = self.close(data=self._data)
 
-            high = data.high[0]
-            low = data.low[0]
-            tp_price = self.entry_price * (1 + self.params.takeprofit_pct)
-            sl_price = self.entry_price * (1 - self.params.stoploss_pct)
-
-            # Check SL before TP (conservative: assume worst outcome
-            # when both levels are breached on the same bar)
-            if low <= sl_price:
-                self.order = self.close(data=data)
-            elif high >= tp_price:
-                self.order = self.close(data=data)
-            elif self.rsi[0] > self.params.rsi_exit:
-                self.order = self.close(data=data)
+    @classmethod
+    def vectorized_signals(cls, open_, high, low, close, rsi_period=14,
+                           rsi_oversold=28, rsi_exit=55, trend_ma=50,
+                           takeprofit_pct=0.015, stoploss_pct=0.006, slippage=0.0):
+        """
+        NumPy/numba replay of the strategy; same conventions and return
+        value as ``MAStrategy.vectorized_signals``.  The entry condition is
+        evaluated for every bar at once, and each trade scans forward for
+        its SL / TP / RSI exit in one kernel call.
+        """
+        rsi, trend, bb_bot = oversold_indicators(close, rsi_period, trend_ma,
+                                                 20, 2.0, 100.0, 50.0)
+        signal = (close > trend) & (rsi < rsi_oversold) & (close <= bb_bot)
+        # NaN disables a level inside the kernel
+        return replay_entries(
+            pack_ohlc(open_, high, low, close), rsi, np.flatnonzero(signal),
+            np.nan if takeprofit_pct is None else float(takeprofit_pct),
+            np.nan if stoploss_pct is None else float(stoploss_pct),
+            float(rsi_exit), float(slippage),
+        )
 
 
 # ---------------------------------------------------------------------------
@@ -157,12 +329,18 @@ class OversoldBounceStrategy(bt.Strategy):
 #   datas[0] = granular (e.g. 1m) for TP/SL execution
 #   datas[1] = signal   (e.g. 15m, resampled) for indicator signals
 # ---------------------------------------------------------------------------
-class OversoldBounceMTFStrategy(bt.Strategy):
+class OversoldBounceMTFStrategy(_EntryPriceMixin, bt.Strategy):
     """
     Same logic as OversoldBounceStrategy but:
       * Indicators & signal generation run on the *higher* timeframe (datas[1])
       * TP / SL checks run on the *lower* (granular) timeframe (datas[0])
+
+    Run mode: runonce/preload, and exactbars=0 so the resampled datas[1]
+    and its indicators keep their whole history alongside datas[0].
     """
+    # Read by backtest.py when building Cerebro
+    _required_cerebro_opts = dict(runonce=True, preload=True, exactbars=0)
+
     params = (
         ("rsi_period", 14),
         ("rsi_oversold", 28),
@@ -174,46 +352,49 @@ class OversoldBounceMTFStrategy(bt.Strategy):
 
     def __init__(self):
         # Indicators on signal timeframe (datas[1])
-        self.rsi = bt.indicators.RSI(self.datas[1].close, period=self.params.rsi_period)
-        self.bb = bt.indicators.BollingerBands(self.datas[1].close, period=20, devfactor=2)
-        self.trend_sma = bt.indicators.SMA(self.datas[1].close, period=self.params.trend_ma)
+        self.ind = FastIndicators(self.datas[1].close,
+                                  rsi_period=self.params.rsi_period,
+                                  trend_period=self.params.trend_ma,
+                                  bb_period=20, devfactor=2)
         self.order = None
         self.entry_price = None
 
-    def notify_order(self, order):
-        if order.status == order.Completed:
-            if order.isbuy():
-                self.entry_price = order.executed.price
-            else:
-                self.entry_price = None
-        if order.status in [order.Completed, order.Canceled, order.Margin, order.Rejected]:
-            self.order = None
+        # Resolve line objects and params once; next() runs every bar
+        self._close = self.datas[1].lines.close
+        self._high = self.datas[0].lines.high
+        self._low = self.datas[0].lines.low
+        self._rsi_line = self.ind.lines.rsi
+        self._bb_bot = self.ind.lines.bb_bot
+        self._trend = self.ind.lines.trend
+        self._tp = self.p.takeprofit_pct
+        self._sl = self.p.stoploss_pct
+        self._rsi_os = self.p.rsi_oversold
+        self._rsi_exit = self.p.rsi_exit
+        self._d0, self._d1 = self.datas[0], self.datas[1]
+        # Signal bars needed before entries are considered.  Once reached
+        # it stays reached, so _armed saves the len() call afterwards.
+        self._warmup = int(self.p.trend_ma)
+        self._armed = False
 
     def next(self):
+        if not self._armed:
+            # Always flat with no order until armed
+            if len(self._d1) < self._warmup:
+                return
+            self._armed = True
+
         if self.order:
             return
 
-        if not self.position:
-            if len(self.datas[1]) < self.params.trend_ma:
-                return
-            price_signal = self.datas[1].close[0]
-            in_uptrend = price_signal > self.trend_sma[0]
-            oversold = self.rsi[0] < self.params.rsi_oversold
-            below_lower_bb = price_signal <= self.bb.lines.bot[0]
+        if not self._in_position:
+            price_signal = self._close[0]
+            in_uptrend = price_signal > self._trend[0]
+            oversold = self._rsi_line[0] < self._rsi_os
+            below_lower_bb = price_signal <= self._bb_bot[0]
             if in_uptrend and oversold and below_lower_bb:
-                self.order = self.buy(data=self.datas[0])
+                self.order = self.buy(data=self._d0)
         else:
-            if self.entry_price is None:
-                return
-
-            high = self.datas[0].high[0]
-            low = self.datas[0].low[0]
-            tp_price = self.entry_price * (1 + self.params.takeprofit_pct)
-            sl_price = self.entry_price * (1 - self.params.stoploss_pct)
-
-            if low <= sl_price:
-                self.order = self.close(data=self.datas[0])
-            elif high >= tp_price:
-                self.order = self.close(data=self.datas[0])
-            elif self.rsi[0] > self.params.rsi_exit:
-                self.order = self.close(data=self.datas[0])
+            if self._low[0] <= self._sl_price or self._high[0] >= self._tp_price:
+                self.order = self.close(data=self._d0)
+            elif self._rsi_line[0] > self._rsi_exit:
+                self.order = self.close(data=self._d0)
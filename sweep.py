@@ -0,0 +1,96 @@
+"""
+MAStrategy parameter sweeps without backtrader.
+
+Every ``(fast, slow, takeprofit_pct, stoploss_pct)`` combination is
+replayed like ``MAStrategy.vectorized_signals`` on one shared set of
+arrays: each distinct MA period is computed once (in parallel), each
+``(fast, slow)`` pair's crossovers once, and the per-combination trade
+walk and accounting run across all cores in ``kernels.simulate_all``.
+Accounting follows ``backtest.py --vectorized`` (PercentSizer-style
+sizing, the same commission model), reduced to the final account value.
+
+Example::
+
+    from backtest import BacktestConfig
+    from sweep import sweep_ma
+
+    cfg = BacktestConfig(symbol="ETHUSDT", start="2025-10-01",
+                         end="2025-12-31", signal_tf="15m",
+                         strategy="strategies.MAStrategy")
+    res = sweep_ma(cfg, fasts=range(5, 30, 5), slows=range(20, 200, 20),
+                   tps=[None, 0.01, 0.02], sls=[None, 0.005])
+    print(res.sort_values("return", ascending=False).head(10))
+"""
+
+from datetime import datetime
+from itertools import product
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from backtest import BacktestConfig, make_comminfo
+from collector import collect, load_bt_dataframe
+from kernels import pack_ohlc, rolling_means, simulate_all
+from strategies import MAStrategy
+
+
+def _flatten(chunks):
+    """Concatenate int index arrays; returns ``(flat, offsets)`` with chunk
+    ``k`` at ``flat[offsets[k]:offsets[k + 1]]``."""
+    offsets = np.zeros(len(chunks) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(x) for x in chunks])
+    return np.concatenate(chunks + [np.empty(0, dtype=np.int64)]), offsets
+
+
+def sweep_ma(cfg: BacktestConfig, fasts: Iterable[int], slows: Iterable[int],
+             tps: Iterable[Optional[float]] = (None,),
+             sls: Iterable[Optional[float]] = (None,)) -> pd.DataFrame:
+    """
+    Replay MAStrategy for every grid combination on ``cfg.signal_tf`` data.
+
+    *cfg* supplies the symbol, date range, data directory and the broker
+    settings (cash, leverage, position_pct, commissions, slippage); its
+    strategy/param/tp/sl fields are ignored.  Pairs with ``fast >= slow``
+    are skipped.  Returns one row per combination.
+    """
+    collect(cfg.symbol, cfg.start, cfg.end, cfg.signal_tf, cfg.data_dir)
+    bt_df = load_bt_dataframe(cfg.symbol, cfg.signal_tf, cfg.data_dir)
+    bt_df = bt_df.loc[datetime.fromisoformat(cfg.start):datetime.fromisoformat(cfg.end)]
+    o, h, l, c = (bt_df[col].to_numpy() for col in ("open", "high", "low", "close"))
+    ohlc = pack_ohlc(o, h, l, c)
+
+    fasts, slows, tps, sls = list(fasts), list(slows), list(tps), list(sls)
+    periods = sorted(set(fasts) | set(slows))
+    mas = dict(zip(periods, rolling_means(c, np.asarray(periods, dtype=np.int64))))
+
+    pairs = [(fast, slow) for fast, slow in product(fasts, slows) if fast < slow]
+    ups, dns = [], []
+    for fast, slow in pairs:
+        cross_up, cross_dn = MAStrategy.crossovers(mas[fast], mas[slow])
+        ups.append(cross_up)
+        dns.append(cross_dn)
+
+    # One row per combination, pair-major; levels as floats with NaN = off
+    combos = [(p, tp, sl) for p in range(len(pairs)) for tp, sl in product(tps, sls)]
+    combo_pair = np.array([p for p, _, _ in combos], dtype=np.int64)
+    combo_tp, combo_sl = (
+        np.array([np.nan if v is None else float(v) for v in col], dtype=float)
+        for col in ([tp for _, tp, _ in combos], [sl for _, _, sl in combos])
+    )
+
+    comminfo = make_comminfo(cfg)
+    end_value, trades, won, lost = simulate_all(
+        ohlc, *_flatten(ups), *_flatten(dns), combo_pair, combo_tp, combo_sl,
+        float(cfg.slippage), float(cfg.cash), cfg.position_pct * cfg.leverage,
+        comminfo.getcommission(1, 1.0),  # commission per unit of notional
+    )
+    return pd.DataFrame({
+        "fast": [pairs[p][0] for p, _, _ in combos],
+        "slow": [pairs[p][1] for p, _, _ in combos],
+        "tp": [tp for _, tp, _ in combos],
+        "sl": [sl for _, _, sl in combos],
+        "trades": trades, "won": won, "lost": lost,
+        "end_value": end_value,
+        "return": (end_value / cfg.cash - 1) * 100,
+    })
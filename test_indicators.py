@@ -0,0 +1,59 @@
+"""
+The ``Fast*`` indicators against the backtrader ones they replace, in
+vectorised (runonce), bar-by-bar and resampled (MTF) runs.
+"""
+
+import backtrader as bt
+import numpy as np
+import pytest
+
+import collector
+from conftest import SYMBOL
+from indicators import FastBB, FastIndicators, FastRSI, FastSMA
+
+
+class _Collect(bt.Strategy):
+    """Record ``(reference, fast)`` line pairs on every bar of the last data."""
+
+    def __init__(self):
+        c = self.datas[-1].close
+        bb, fbb = bt.ind.BollingerBands(c, period=20, devfactor=2.0), FastBB(c, period=20)
+        fi = FastIndicators(c, rsi_period=14, trend_period=50, bb_period=20)
+        rsi, sma = bt.ind.RSI(c, period=14), bt.ind.SMA(c, period=50)
+        self.pairs = {
+            "sma": (bt.ind.SMA(c, period=30).sma, FastSMA(c, period=30).sma),
+            "rsi": (rsi.rsi, FastRSI(c, period=14).rsi),
+            "bb.mid": (bb.mid, fbb.mid),
+            "bb.top": (bb.top, fbb.top),
+            "bb.bot": (bb.bot, fbb.bot),
+            "fi.rsi": (rsi.rsi, fi.rsi),
+            "fi.trend": (sma.sma, fi.trend),
+            "fi.bb_bot": (bb.bot, fi.bb_bot),
+        }
+        self.rows = []
+
+    def next(self):
+        self.rows.append([line[0] for pair in self.pairs.values() for line in pair])
+
+
+@pytest.mark.parametrize("mtf", [False, True], ids=["1m", "mtf"])
+@pytest.mark.parametrize("runonce", [True, False], ids=["runonce", "next"])
+def test_fast_indicators_match_backtrader(data_dir, runonce, mtf):
+    df = collector.load_bt_dataframe(SYMBOL, "1m", data_dir)
+    cerebro = bt.Cerebro(runonce=runonce, preload=True, stdstats=False)
+    data = bt.feeds.PandasData(dataname=df)
+    cerebro.adddata(data)
+    if mtf:
+        cerebro.resampledata(data, timeframe=bt.TimeFrame.Minutes, compression=15)
+    cerebro.addstrategy(_Collect)
+    strat = cerebro.run()[0]
+
+    rows = np.array(strat.rows)
+    assert len(rows) > 100
+    for k, name in enumerate(strat.pairs):
+        ref, fast = rows[:, 2 * k], rows[:, 2 * k + 1]
+        if "bb" in name:
+            # backtrader squares with pow(x, 2.0); the kernel with x * x
+            np.testing.assert_allclose(fast, ref, rtol=1e-12, err_msg=name)
+        else:
+            np.testing.assert_array_equal(fast, ref, err_msg=name)
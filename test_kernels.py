@@ -0,0 +1,68 @@
+"""
+Edge cases of the sliding-sum kernels, run both compiled (numba) and as
+the plain-Python fallback used when numba is missing.
+"""
+
+import importlib
+import math
+import sys
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture(params=["numba", "python"])
+def kernels(request, monkeypatch):
+    """A fresh import of ``kernels`` in the requested mode."""
+    if request.param == "python":
+        monkeypatch.setitem(sys.modules, "numba", None)
+    else:
+        pytest.importorskip("numba")
+    monkeypatch.setitem(sys.modules, "kernels_aot", None)
+    monkeypatch.delitem(sys.modules, "kernels", raising=False)
+    return importlib.import_module("kernels")
+
+
+def _sma(x, period):
+    """Reference SMA: ``math.fsum`` per window, NaN for non-finite windows."""
+    out = np.full(len(x), np.nan)
+    for i in range(period - 1, len(x)):
+        window = x[i - period + 1:i + 1]
+        if np.isfinite(window).all():
+            out[i] = math.fsum(window) / period
+    return out
+
+
+def _series(kind):
+    x = np.linspace(1.0, 2.0, 3000)
+    if kind == "nan-led":
+        x[:15] = np.nan
+    elif kind == "inf":
+        x[100] = np.inf
+        x[200] = -np.inf
+        x[300:310] = np.nan
+    return x
+
+
+@pytest.mark.parametrize("kind", ["nan-led", "inf"])
+def test_rolling_mean_nonfinite(kernels, kind):
+    x = _series(kind)
+    for period in (1, 5, 100):
+        np.testing.assert_array_equal(kernels.rolling_mean(x, period), _sma(x, period))
+
+
+@pytest.mark.parametrize("kind", ["nan-led", "inf"])
+def test_oversold_indicators_nonfinite(kernels, kind):
+    x = _series(kind)
+    rsi, trend, bot = kernels.oversold_indicators(x, 14, 50, 20, 2.0, 100.0, 50.0)
+    np.testing.assert_array_equal(rsi, kernels.wilder_rsi(x, 14, 100.0, 50.0))
+    np.testing.assert_array_equal(trend, kernels.rolling_mean(x, 50))
+    np.testing.assert_array_equal(bot, kernels.bollinger(x, 20, 2.0)[2])
+
+
+def test_add_partial_stays_in_bounds(kernels):
+    partials = np.empty(8)
+    n = 0
+    for v in [np.nan, np.inf, 1e308, 1e308, -np.inf] * 10:
+        n = kernels._add_partial(partials, n, v)
+        assert n <= len(partials)
@@ -0,0 +1,51 @@
+"""
+``backtest.py --vectorized`` and ``sweep_ma`` against the Cerebro run they
+stand in for: same ending value and trade counts.
+"""
+
+from dataclasses import replace
+
+import pandas as pd
+import pytest
+
+from backtest import BacktestConfig, run_backtest
+from conftest import END, START, SYMBOL
+from sweep import sweep_ma
+
+_CASES = [
+    ("strategies.MAStrategy", None, None, []),
+    ("strategies.MAStrategy", 0.01, 0.005, ["fast=5", "slow=50"]),
+    ("strategies.OversoldBounceStrategy", None, None, ["rsi_oversold=45"]),
+    ("strategies.OversoldBounceStrategy", 0.008, 0.004,
+     ["rsi_oversold=40", "rsi_exit=60", "trend_ma=100"]),
+]
+
+
+def _cfg(data_dir, strategy, **kw):
+    return BacktestConfig(symbol=SYMBOL, start=START, end=END, signal_tf="1m",
+                          strategy=strategy, data_dir=data_dir, **kw)
+
+
+def _assert_same(vec, ref):
+    assert vec["trades"] > 0
+    for key in ("trades", "won", "lost"):
+        assert vec[key] == ref[key], key
+    assert vec["end_value"] == pytest.approx(ref["end_value"], rel=1e-9)
+
+
+@pytest.mark.parametrize("strategy, tp, sl, param", _CASES)
+def test_vectorized_matches_cerebro(data_dir, strategy, tp, sl, param):
+    cfg = _cfg(data_dir, strategy, tp=tp, sl=sl, param=param)
+    _assert_same(run_backtest(replace(cfg, vectorized=True)), run_backtest(cfg))
+
+
+def test_sweep_ma_matches_cerebro(data_dir):
+    cfg = _cfg(data_dir, "strategies.MAStrategy")
+    res = sweep_ma(cfg, fasts=[5, 10], slows=[30, 50], tps=[None, 0.01], sls=[None, 0.005])
+    assert len(res) == 16
+    for row in res.iloc[::5].itertuples():
+        ref = run_backtest(replace(
+            cfg, tp=None if pd.isna(row.tp) else row.tp,
+            sl=None if pd.isna(row.sl) else row.sl,
+            param=[f"fast={row.fast}", f"slow={row.slow}"]))
+        _assert_same(row._asdict(), ref)